@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import anyio
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.infrastructure.db import pool_capacity, session_scope
+
+
+class DBSessionMiddleware:
+    """
+    Give every HTTP request its own scoped DB session and release it when the
+    response (including any streamed body) has been sent.
+
+    A request keeps its pooled connection until then, so at most
+    ``max_concurrency`` requests (the pool capacity by default) are admitted at
+    once; the rest wait here on the event loop, holding neither a connection nor
+    a worker thread. Only paths under ``path_prefix`` touch the database, so
+    everything else (metrics, docs) bypasses the limiter and stays responsive
+    while the pool is saturated.
+    """
+
+    def __init__(
+        self, app: ASGIApp, max_concurrency: int | None = None, path_prefix: str = ""
+    ) -> None:
+        self.app = app
+        self._path_prefix = path_prefix
+        self._limiter = anyio.Semaphore(
+            pool_capacity() if max_concurrency is None else max_concurrency
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(self._path_prefix):
+            await self.app(scope, receive, send)
+            return
+        async with self._limiter:
+            async with session_scope():
+                await self.app(scope, receive, send)
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from decimal import Decimal
+from itertools import islice
+from typing import Any
+
+import orjson
+from fastapi.responses import ORJSONResponse
+
+from app.domain.repositories import STREAM_BATCH_SIZE
+
+
+def _default(value: object) -> str:
+    # Same wire format as pydantic: Decimal is serialized as a string.
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(payload: Any) -> bytes:
+    return orjson.dumps(
+        payload, default=_default, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+    )
+
+
+class AppJSONResponse(ORJSONResponse):
+    """Default response class: orjson encoding with the pydantic-compatible format of dumps()."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def iter_json_array(
+    items: Iterable[Any], *, batch_size: int = STREAM_BATCH_SIZE
+) -> Iterator[bytes]:
+    """
+    Encode items as one JSON array, yielding a chunk per batch of items.
+
+    Batching keeps memory at O(batch_size) and avoids a threadpool hop per item
+    when the iterator is consumed by StreamingResponse.
+    """
+    iterator = iter(items)
+    separator = b"["
+    while batch := list(islice(iterator, batch_size)):
+        yield separator + b",".join(dumps(item) for item in batch)
+        separator = b","
+    yield b"]" if separator == b"," else b"[]"
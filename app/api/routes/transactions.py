@@ -1,9 +1,12 @@
 from __future__ import annotations
 
 from datetime import datetime
+from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 
+from app.api.responses import iter_json_array
 from app.api.schemas.transactions import (
     CategoryExpenseResponse,
     TransactionCreateRequest,
@@ -11,25 +14,25 @@ from app.api.schemas.transactions import (
     TransactionsByCategoriesResponse,
     TransactionsPeriodStatsResponse,
 )
-from app.application.services.transaction_service import TransactionService
+from app.application.services.transaction_service import NewTransaction, TransactionService
 from app.domain.errors import DomainValidationError, NotFoundError
 from app.domain.models import Transaction
-from app.infrastructure.db import get_session_factory
-from app.infrastructure.repositories.transaction_repo_sqlalchemy import (
-    SQLAlchemyTransactionRepository,
-)
 
 router = APIRouter(tags=["transactions"])
 
+# One bulk request is validated in memory and inserted in a single transaction.
+MAX_BULK_ITEMS = 1000
+
 
-def get_transaction_service() -> TransactionService:
-    session_factory = get_session_factory()
-    repo = SQLAlchemyTransactionRepository(session_factory=session_factory)
-    return TransactionService(repo=repo)
+def get_transaction_service(request: Request) -> TransactionService:
+    # Built once in the app lifespan; the service and repository hold no per-request state.
+    service: TransactionService = request.app.state.transaction_service
+    return service
 
 
 def _to_response(tx: Transaction) -> TransactionResponse:
-    return TransactionResponse(
+    # Domain objects are already validated; skip re-running pydantic validators.
+    return TransactionResponse.model_construct(
         id=tx.id,
         user_id=tx.user_id,
         type=tx.type.value,
@@ -43,6 +46,22 @@ def _to_response(tx: Transaction) -> TransactionResponse:
     )
 
 
+def _to_payload(tx: Transaction) -> dict[str, Any]:
+    # Plain-dict counterpart of _to_response for the streamed list endpoint.
+    return {
+        "id": tx.id,
+        "user_id": tx.user_id,
+        "type": tx.type.value,
+        "amount": tx.money.amount,
+        "currency": tx.money.currency,
+        "occurred_at": tx.occurred_at,
+        "category_id": tx.category_id,
+        "account_id": tx.account_id,
+        "description": tx.description,
+        "created_at": tx.created_at,
+    }
+
+
 @router.post(
     "/transactions",
     response_model=TransactionResponse,
@@ -71,15 +90,51 @@ def create_transaction(
     return _to_response(tx)
 
 
-@router.get("/transactions", response_model=list[TransactionResponse])
-def list_transactions(
+@router.post(
+    "/transactions/bulk",
+    response_model=list[TransactionResponse],
+    status_code=status.HTTP_201_CREATED,
+)
+def create_transactions_bulk(
+    requests: list[TransactionCreateRequest] = Body(..., max_length=MAX_BULK_ITEMS),
     service: TransactionService = Depends(get_transaction_service),
 ) -> list[TransactionResponse]:
     user_id = "demo-user"
-    transactions = service.list_transactions(user_id=user_id)
+    try:
+        transactions = service.record_transactions(
+            user_id=user_id,
+            items=[
+                NewTransaction(
+                    tx_type=item.type,
+                    amount=item.amount,
+                    currency=item.currency,
+                    occurred_at=item.occurred_at,
+                    category_id=item.category_id,
+                    account_id=item.account_id,
+                    description=item.description,
+                )
+                for item in requests
+            ],
+        )
+    except DomainValidationError as e:
+        raise HTTPException(status_code=422, detail=str(e)) from e
+
     return [_to_response(tx) for tx in transactions]
 
 
+@router.get("/transactions", response_model=list[TransactionResponse])
+def list_transactions(
+    service: TransactionService = Depends(get_transaction_service),
+) -> StreamingResponse:
+    user_id = "demo-user"
+    # Rows are fetched and encoded batch by batch while the response is being sent.
+    transactions = service.iter_transactions(user_id=user_id)
+    return StreamingResponse(
+        iter_json_array(_to_payload(tx) for tx in transactions),
+        media_type="application/json",
+    )
+
+
 @router.get(
     "/transactions/by-categories",
     response_model=TransactionsByCategoriesResponse,
@@ -103,7 +158,7 @@ def list_transactions_by_categories(
         transactions=[_to_response(tx) for tx in transactions],
         total_expense=total_expense,
         expense_by_category=[
-            CategoryExpenseResponse(category_id=category_id, total_expense=total)
+            CategoryExpenseResponse.model_construct(category_id=category_id, total_expense=total)
             for category_id, total in expense_by_category.items()
         ],
     )
@@ -134,7 +189,7 @@ def list_transactions_by_period(
         transactions=[_to_response(tx) for tx in transactions],
         total_expense=total_expense,
         expense_by_category=[
-            CategoryExpenseResponse(category_id=category_id, total_expense=total)
+            CategoryExpenseResponse.model_construct(category_id=category_id, total_expense=total)
             for category_id, total in expense_by_category.items()
         ],
     )
@@ -4,10 +4,15 @@ from datetime import datetime
 from decimal import Decimal
 from typing import Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+# Schemas are immutable and reject unknown fields.
+_MODEL_CONFIG = ConfigDict(extra="forbid", frozen=True)
 
 
 class TransactionCreateRequest(BaseModel):
+    model_config = _MODEL_CONFIG
+
     type: Literal["expense", "income"]
     amount: Decimal = Field(..., gt=0)
     currency: str = Field(default="RUB", min_length=3, max_length=3)
@@ -18,6 +23,8 @@ class TransactionCreateRequest(BaseModel):
 
 
 class TransactionResponse(BaseModel):
+    model_config = _MODEL_CONFIG
+
     id: str
     user_id: str
     type: Literal["expense", "income"]
@@ -31,17 +38,23 @@ class TransactionResponse(BaseModel):
 
 
 class CategoryExpenseResponse(BaseModel):
+    model_config = _MODEL_CONFIG
+
     category_id: str | None
     total_expense: Decimal
 
 
 class TransactionsByCategoriesResponse(BaseModel):
+    model_config = _MODEL_CONFIG
+
     transactions: list[TransactionResponse]
     total_expense: Decimal
     expense_by_category: list[CategoryExpenseResponse]
 
 
 class TransactionsPeriodStatsResponse(BaseModel):
+    model_config = _MODEL_CONFIG
+
     start_at: datetime
     end_at: datetime
     transactions: list[TransactionResponse]
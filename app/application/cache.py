@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+
+
+class QueryCache(ABC):
+    """
+    Cache for read-only query results.
+
+    Entries are grouped by scope (the user id), so a write can drop every cached
+    result of that user at once.
+
+    Every invalidate() bumps the scope's generation. A reader takes generation()
+    before querying and passes it to set(), so a result read before a concurrent
+    write is never cached after that write's invalidation.
+    """
+
+    @abstractmethod
+    def get(self, scope: str, key: str) -> object | None: ...
+
+    @abstractmethod
+    def generation(self, scope: str) -> int: ...
+
+    @abstractmethod
+    def set(self, scope: str, key: str, value: object, *, generation: int | None = None) -> None:
+        """
+        Store ``value``; with ``generation`` given, skip it if the scope was invalidated since.
+        """
+
+    @abstractmethod
+    def invalidate(self, scope: str) -> None: ...
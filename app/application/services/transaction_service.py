@@ -1,16 +1,36 @@
 from __future__ import annotations
 
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
 from datetime import UTC, datetime
 from decimal import Decimal
+from typing import cast
 
+from app.application.cache import QueryCache
 from app.domain.errors import DomainValidationError, NotFoundError
 from app.domain.models import Money, Transaction, TransactionType
 from app.domain.repositories import TransactionRepository
 
+_TYPE_MAP: dict[str, TransactionType] = {t.value: t for t in TransactionType}
+
+
+@dataclass(frozen=True, slots=True)
+class NewTransaction:
+    """Input for one item of a bulk record_transactions call."""
+
+    tx_type: str
+    amount: Decimal
+    currency: str
+    occurred_at: datetime
+    category_id: str | None = None
+    account_id: str | None = None
+    description: str | None = None
+
 
 class TransactionService:
-    def __init__(self, repo: TransactionRepository) -> None:
+    def __init__(self, repo: TransactionRepository, cache: QueryCache | None = None) -> None:
         self._repo = repo
+        self._cache = cache
 
     def record_transaction(
         self,
@@ -24,34 +44,48 @@ class TransactionService:
         account_id: str | None,
         description: str | None,
     ) -> Transaction:
-        # Observability hook:
-        # - add structured logging: event="RecordTransaction", user_id, amount, currency
-        # - add metrics: counter transactions_created_total{type,currency}, histogram latency
-
-        try:
-            ttype = TransactionType(tx_type)
-        except ValueError as e:
-            raise DomainValidationError(f"Unsupported transaction type: {tx_type}") from e
-
-        if occurred_at.tzinfo is None:
-            occurred_at = occurred_at.replace(tzinfo=UTC)
-
-        money = Money(amount=amount, currency=currency)
-        tx = Transaction.create(
+        tx = self._build_transaction(
             user_id=user_id,
-            type=ttype,
-            money=money,
+            tx_type=tx_type,
+            amount=amount,
+            currency=currency,
             occurred_at=occurred_at,
             category_id=category_id,
             account_id=account_id,
             description=description,
         )
         self._repo.add(tx)
+        if self._cache is not None:
+            self._cache.invalidate(user_id)
         return tx
 
+    def record_transactions(
+        self,
+        *,
+        user_id: str,
+        items: Iterable[NewTransaction],
+    ) -> list[Transaction]:
+        # Every item is validated before anything is written, then all rows go in one commit.
+        transactions = [
+            self._build_transaction(
+                user_id=user_id,
+                tx_type=item.tx_type,
+                amount=item.amount,
+                currency=item.currency,
+                occurred_at=item.occurred_at,
+                category_id=item.category_id,
+                account_id=item.account_id,
+                description=item.description,
+            )
+            for item in items
+        ]
+        if transactions:
+            self._repo.add_many(transactions)
+            if self._cache is not None:
+                self._cache.invalidate(user_id)
+        return transactions
+
     def get_transaction(self, *, user_id: str, transaction_id: str) -> Transaction:
-        # Observability hook:
-        # - add structured logging: event="GetTransaction", user_id, transaction_id
         tx = self._repo.get(transaction_id)
         if tx is None or tx.user_id != user_id:
             raise NotFoundError("Transaction not found")
@@ -60,31 +94,62 @@ class TransactionService:
     def list_transactions(self, *, user_id: str) -> list[Transaction]:
         return self._repo.list_by_user(user_id)
 
+    def iter_transactions(self, *, user_id: str) -> Iterator[Transaction]:
+        return self._repo.iter_by_user(user_id)
+
     def get_transactions_by_categories(
         self,
         *,
         user_id: str,
         category_ids: list[str],
     ) -> tuple[list[Transaction], Decimal, dict[str, Decimal]]:
-        unique_category_ids = list(dict.fromkeys(category_ids))
-        if not unique_category_ids:
+        if not category_ids:
             raise DomainValidationError("category_ids must not be empty")
 
+        # One dict both drops duplicate ids (keeping request order) and holds the zero
+        # totals; the SQL IN (...) filters below don't care about duplicates.
+        expense_by_category = dict.fromkeys(category_ids, Decimal("0"))
+
+        cache_key = "categories|" + "|".join(sorted(expense_by_category))
+        if self._cache is not None:
+            cached = self._cache.get(user_id, cache_key)
+            if cached is not None:
+                transactions, total_expense, cached_by_category = cast(
+                    tuple[list[Transaction], Decimal, dict[str, Decimal]], cached
+                )
+                # Same categories may be requested in a different order.
+                return (
+                    list(transactions),
+                    total_expense,
+                    {
+                        category_id: cached_by_category[category_id]
+                        for category_id in expense_by_category
+                    },
+                )
+
+        # Taken before reading: a write landing mid-read must keep this result out of the cache.
+        generation = self._cache.generation(user_id) if self._cache is not None else None
         transactions = self._repo.list_by_user_and_categories(
             user_id=user_id,
-            category_ids=unique_category_ids,
+            category_ids=category_ids,
         )
 
-        expense_by_category = {category_id: Decimal("0") for category_id in unique_category_ids}
-        total_expense = Decimal("0")
-        for tx in transactions:
-            if tx.type == TransactionType.expense:
-                total_expense += tx.money.amount
-                if tx.category_id is not None:
-                    expense_by_category[tx.category_id] = (
-                        expense_by_category.get(tx.category_id, Decimal("0")) + tx.money.amount
-                    )
-
+        # Sums are computed by the database; only the listed rows are materialized.
+        expense_by_category.update(
+            self._repo.aggregate_expense_by_categories(
+                user_id=user_id,
+                category_ids=category_ids,
+            )
+        )
+        total_expense = sum(expense_by_category.values(), Decimal("0"))
+
+        if self._cache is not None:
+            self._cache.set(
+                user_id,
+                cache_key,
+                (list(transactions), total_expense, dict(expense_by_category)),
+                generation=generation,
+            )
         return transactions, total_expense, expense_by_category
 
     def get_transactions_for_period(
@@ -99,23 +164,68 @@ class TransactionService:
         if start_at > end_at:
             raise DomainValidationError("start_at must be before or equal to end_at")
 
+        cache_key = f"period|{start_at.isoformat()}|{end_at.isoformat()}"
+        if self._cache is not None:
+            cached = self._cache.get(user_id, cache_key)
+            if cached is not None:
+                transactions, total_expense, expense_by_category = cast(
+                    tuple[list[Transaction], Decimal, dict[str | None, Decimal]], cached
+                )
+                return list(transactions), total_expense, dict(expense_by_category)
+
+        generation = self._cache.generation(user_id) if self._cache is not None else None
         transactions = self._repo.list_by_user_and_period(
             user_id=user_id,
             start_at=start_at,
             end_at=end_at,
         )
 
-        expense_by_category: dict[str | None, Decimal] = {}
-        total_expense = Decimal("0")
-        for tx in transactions:
-            if tx.type == TransactionType.expense:
-                total_expense += tx.money.amount
-                expense_by_category[tx.category_id] = (
-                    expense_by_category.get(tx.category_id, Decimal("0")) + tx.money.amount
-                )
-
+        expense_by_category = self._repo.aggregate_expense_by_period(
+            user_id=user_id,
+            start_at=start_at,
+            end_at=end_at,
+        )
+        total_expense = sum(expense_by_category.values(), Decimal("0"))
+
+        if self._cache is not None:
+            self._cache.set(
+                user_id,
+                cache_key,
+                (list(transactions), total_expense, dict(expense_by_category)),
+                generation=generation,
+            )
         return transactions, total_expense, expense_by_category
 
+    @staticmethod
+    def _build_transaction(
+        *,
+        user_id: str,
+        tx_type: str,
+        amount: Decimal,
+        currency: str,
+        occurred_at: datetime,
+        category_id: str | None,
+        account_id: str | None,
+        description: str | None,
+    ) -> Transaction:
+        ttype = _TYPE_MAP.get(tx_type)
+        if ttype is None:
+            raise DomainValidationError(f"Unsupported transaction type: {tx_type}")
+
+        if occurred_at.tzinfo is None:
+            occurred_at = occurred_at.replace(tzinfo=UTC)
+
+        money = Money(amount=amount, currency=currency)
+        return Transaction.create(
+            user_id=user_id,
+            type=ttype,
+            money=money,
+            occurred_at=occurred_at,
+            category_id=category_id,
+            account_id=account_id,
+            description=description,
+        )
+
     @staticmethod
     def _normalize_datetime(value: datetime) -> datetime:
         if value.tzinfo is None:
@@ -1,29 +1,77 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import os
+from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from decimal import Decimal
 from enum import Enum
-from uuid import uuid4
+from time import time_ns
+from uuid import UUID
 
 from app.domain.errors import DomainValidationError
 
 
+def uuid7() -> str:
+    """
+    Time-ordered UUID (RFC 9562, version 7): 48-bit Unix ms timestamp + random bits.
+
+    New ids sort after older ones, so primary-key inserts append to the right edge
+    of the B-tree index instead of landing on random pages.
+    """
+    timestamp_ms = time_ns() // 1_000_000
+    rand = int.from_bytes(os.urandom(10), "big")
+    value = (timestamp_ms & ((1 << 48) - 1)) << 80
+    value |= 0x7 << 76  # version
+    value |= ((rand >> 62) & 0xFFF) << 64  # rand_a
+    value |= 0b10 << 62  # variant
+    value |= rand & ((1 << 62) - 1)  # rand_b
+    return str(UUID(int=value))
+
+
 class TransactionType(str, Enum):
     expense = "expense"
     income = "income"
 
 
+# Largest amount storable as cents (and the former NUMERIC(12, 2) column bound).
+MAX_AMOUNT = Decimal("9999999999.99")
+
+
 @dataclass(frozen=True, slots=True)
 class Money:
     amount: Decimal
     currency: str
+    # Amount in minor units, used for storage and integer summation.
+    cents: int = field(init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         if self.amount <= 0:
             raise DomainValidationError("Amount must be greater than 0")
+        if self.amount > MAX_AMOUNT:
+            raise DomainValidationError(f"Amount must not exceed {MAX_AMOUNT}")
         if not self.currency or len(self.currency) != 3:
             raise DomainValidationError("Currency must be a 3-letter code (e.g. RUB)")
+        cents = self.amount * 100
+        if cents != cents.to_integral_value():
+            raise DomainValidationError("Amount must have at most 2 decimal places")
+        object.__setattr__(self, "cents", int(cents))
+
+    @staticmethod
+    def amount_from_cents(cents: int) -> Decimal:
+        return Decimal(cents).scaleb(-2)
+
+    @classmethod
+    def _unchecked(cls, cents: int, currency: str) -> Money:
+        """
+        Rebuild Money from already-validated storage values, skipping __post_init__.
+
+        Only for the repository read path; new amounts must go through the constructor.
+        """
+        obj = cls.__new__(cls)
+        object.__setattr__(obj, "amount", cls.amount_from_cents(cents))
+        object.__setattr__(obj, "currency", currency)
+        object.__setattr__(obj, "cents", cents)
+        return obj
 
 
 @dataclass(frozen=True, slots=True)
@@ -58,7 +106,7 @@ class Transaction:
 
         now = datetime.now(tz=UTC)
         return Transaction(
-            id=str(uuid4()),
+            id=uuid7(),
             user_id=user_id,
             type=type,
             money=money,
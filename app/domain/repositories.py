@@ -1,21 +1,33 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator
 from datetime import datetime
+from decimal import Decimal
 
 from app.domain.models import Transaction
 
+# Rows per fetch for iter_by_user(); the API also encodes streamed responses in
+# batches of this size.
+STREAM_BATCH_SIZE = 500
+
 
 class TransactionRepository(ABC):
     @abstractmethod
     def add(self, tx: Transaction) -> None: ...
 
+    @abstractmethod
+    def add_many(self, txs: Iterable[Transaction]) -> None: ...
+
     @abstractmethod
     def get(self, transaction_id: str) -> Transaction | None: ...
 
     @abstractmethod
     def list_by_user(self, user_id: str) -> list[Transaction]: ...
 
+    @abstractmethod
+    def iter_by_user(self, user_id: str) -> Iterator[Transaction]: ...
+
     @abstractmethod
     def list_by_user_and_categories(
         self,
@@ -32,3 +44,20 @@ class TransactionRepository(ABC):
         start_at: datetime,
         end_at: datetime,
     ) -> list[Transaction]: ...
+
+    @abstractmethod
+    def aggregate_expense_by_categories(
+        self,
+        *,
+        user_id: str,
+        category_ids: list[str],
+    ) -> dict[str, Decimal]: ...
+
+    @abstractmethod
+    def aggregate_expense_by_period(
+        self,
+        *,
+        user_id: str,
+        start_at: datetime,
+        end_at: datetime,
+    ) -> dict[str | None, Decimal]: ...
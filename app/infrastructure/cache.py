@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+
+from app.application.cache import QueryCache
+
+
+class InMemoryQueryCache(QueryCache):
+    """
+    Process-local LRU cache with a per-entry TTL.
+
+    Invalidation only reaches the current process; with several workers a
+    stale result can be served for at most ``ttl_seconds``.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float = 60.0,
+        max_entries: int = 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[tuple[str, str], tuple[float, object]] = OrderedDict()
+        # One counter per scope ever invalidated, i.e. per user that has written.
+        self._generations: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, scope: str, key: str) -> object | None:
+        with self._lock:
+            entry = self._entries.get((scope, key))
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[(scope, key)]
+                return None
+            self._entries.move_to_end((scope, key))
+            return value
+
+    def generation(self, scope: str) -> int:
+        with self._lock:
+            return self._generations.get(scope, 0)
+
+    def set(self, scope: str, key: str, value: object, *, generation: int | None = None) -> None:
+        with self._lock:
+            if generation is not None and generation != self._generations.get(scope, 0):
+                return
+            self._entries[(scope, key)] = (self._clock() + self._ttl_seconds, value)
+            self._entries.move_to_end((scope, key))
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, scope: str) -> None:
+        with self._lock:
+            self._generations[scope] = self._generations.get(scope, 0) + 1
+            for entry_key in [k for k in self._entries if k[0] == scope]:
+                del self._entries[entry_key]
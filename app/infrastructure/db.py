@@ -1,15 +1,138 @@
 from __future__ import annotations
 
-from collections.abc import Callable
+import threading
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from pathlib import Path
+from typing import Any
 
-from sqlalchemy import Engine, create_engine
-from sqlalchemy.orm import Session, sessionmaker
+import anyio
+from sqlalchemy import Engine, create_engine, event, inspect, make_url, text
+from sqlalchemy.orm import Session, scoped_session, sessionmaker
+from sqlalchemy.pool import StaticPool
 
-from app.infrastructure.repositories.transaction_repo_sqlalchemy import Base
+from app.infrastructure.repositories.transaction_repo_sqlalchemy import Base, TransactionORM
+
+POOL_SIZE = 20
+MAX_OVERFLOW = 10
+POOL_TIMEOUT_SECONDS = 30
+POOL_RECYCLE_SECONDS = 3600
+
+# Single-column indexes of releases before the composite ix_tx_* ones; they only
+# slow down inserts now. ix_transactions_account_id is still part of the model.
+_LEGACY_INDEXES = (
+    "ix_transactions_user_id",
+    "ix_transactions_occurred_at",
+    "ix_transactions_category_id",
+)
 
 _engine: Engine | None = None
-_session_factory: sessionmaker[Session] | None = None
+_session_factory: scoped_session[Session] | None = None
+_request_scope: ContextVar[object | None] = ContextVar("db_request_scope", default=None)
+
+
+def _current_scope() -> object:
+    # Inside session_scope() every thread serving the request shares one session;
+    # outside of it we fall back to the usual thread-local scoping.
+    scope = _request_scope.get()
+    return threading.get_ident() if scope is None else scope
+
+
+def _engine_options(database_url: str) -> dict[str, Any]:
+    """
+    Pick pool settings for the given database URL.
+
+    In-memory SQLite lives inside a single connection, so it has to be shared
+    via StaticPool. Everything else gets a sized QueuePool with pre-ping so
+    dead connections are replaced instead of failing the request.
+    """
+    url = make_url(database_url)
+    options: dict[str, Any] = {}
+    if url.get_backend_name() == "sqlite":
+        options["connect_args"] = {"check_same_thread": False}
+        if url.database in (None, "", ":memory:"):
+            options["poolclass"] = StaticPool
+            return options
+
+    options.update(
+        pool_size=POOL_SIZE,
+        max_overflow=MAX_OVERFLOW,
+        pool_timeout=POOL_TIMEOUT_SECONDS,
+        pool_pre_ping=True,
+        pool_recycle=POOL_RECYCLE_SECONDS,
+    )
+    return options
+
+
+def pool_capacity() -> int:
+    """
+    Most connections the engine's pool hands out at the same time.
+    """
+    return POOL_SIZE + MAX_OVERFLOW
+
+
+def _set_sqlite_pragmas(dbapi_connection: Any, _connection_record: Any) -> None:
+    # WAL + NORMAL sync: one fsync per checkpoint instead of two per commit.
+    # Negative cache_size is in KiB, i.e. a 64 MiB page cache per connection.
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA cache_size=-65536")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
+def _upgrade_schema(engine: Engine) -> None:
+    """
+    Bring a transactions table from an older release up to the current model.
+
+    Databases created before amounts were stored as integer cents get their
+    ``amount`` column converted to ``amount_cents``; superseded indexes are
+    dropped and missing ones added. Anything else that does not match the model stops startup with a
+    clear error instead of failing on the first request.
+    """
+    table = Base.metadata.tables[TransactionORM.__tablename__]
+    columns = {column["name"] for column in inspect(engine).get_columns(table.name)}
+    with engine.begin() as connection:
+        if "amount_cents" not in columns and "amount" in columns:
+            connection.execute(
+                text("ALTER TABLE transactions ADD COLUMN amount_cents BIGINT NOT NULL DEFAULT 0")
+            )
+            connection.execute(
+                text("UPDATE transactions SET amount_cents = CAST(ROUND(amount * 100) AS BIGINT)")
+            )
+            connection.execute(text("ALTER TABLE transactions DROP COLUMN amount"))
+            # The DEFAULT only existed to add a NOT NULL column to a populated table.
+            # SQLite cannot alter column defaults, and the ORM always sets the value.
+            if connection.dialect.name != "sqlite":
+                connection.execute(
+                    text("ALTER TABLE transactions ALTER COLUMN amount_cents DROP DEFAULT")
+                )
+            columns = (columns - {"amount"}) | {"amount_cents"}
+
+        missing = sorted({column.name for column in table.columns} - columns)
+        if missing:
+            raise RuntimeError(
+                f"Table '{table.name}' is missing columns {missing}. "
+                "Migrate or recreate the database before starting the app."
+            )
+        for name in _LEGACY_INDEXES:
+            connection.execute(text(f"DROP INDEX IF EXISTS {name}"))
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+
+
+def create_db_engine(database_url: str) -> Engine:
+    """
+    Create a configured engine and make sure the schema exists and is current.
+    """
+    engine = create_engine(database_url, future=True, **_engine_options(database_url))
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", _set_sqlite_pragmas)
+    Base.metadata.create_all(bind=engine)
+    _upgrade_schema(engine)
+    return engine
 
 
 def init_db(database_url: str | None = None) -> None:
@@ -26,30 +149,59 @@ def init_db(database_url: str | None = None) -> None:
         db_path = data_dir / "app.db"
         database_url = f"sqlite:///{db_path}"
 
-    _engine = create_engine(database_url, future=True)
-    Base.metadata.create_all(bind=_engine)
-    _session_factory = sessionmaker(
-        bind=_engine,
-        autocommit=False,
-        autoflush=False,
-        future=True,
+    _engine = create_db_engine(database_url)
+    _session_factory = scoped_session(
+        sessionmaker(
+            bind=_engine,
+            autocommit=False,
+            autoflush=False,
+            expire_on_commit=False,
+            future=True,
+        ),
+        scopefunc=_current_scope,
     )
 
 
 def get_session_factory() -> Callable[[], Session]:
     """
     Return initialized session factory.
+
+    The factory is a scoped_session registry: repeated calls within one scope
+    return the same Session.
     """
     if _session_factory is None:
         raise RuntimeError("Database is not initialized. Call init_db() at startup.")
     return _session_factory
 
 
+@asynccontextmanager
+async def session_scope() -> AsyncIterator[None]:
+    """
+    Share one Session across everything running inside the block, then release it.
+
+    Used per HTTP request, so all repository calls of a request reuse a single
+    connection checkout instead of opening a session each. Closing the session
+    rolls back and returns its connection to the pool, a round trip on server
+    databases, so it runs in a worker thread (with this context, so the scope
+    still resolves) and is shielded so a cancelled request cannot skip it.
+    """
+    token = _request_scope.set(object())
+    try:
+        yield
+    finally:
+        if _session_factory is not None:
+            with anyio.CancelScope(shield=True):
+                await anyio.to_thread.run_sync(_session_factory.remove)
+        _request_scope.reset(token)
+
+
 def shutdown_db() -> None:
     """
     Dispose singleton engine/sessionmaker at application shutdown.
     """
     global _engine, _session_factory
+    if _session_factory is not None:
+        _session_factory.remove()
     if _engine is not None:
         _engine.dispose()
     _engine = None
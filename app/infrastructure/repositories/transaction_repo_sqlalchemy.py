@@ -1,14 +1,15 @@
 from __future__ import annotations
 
-from collections.abc import Callable
+from collections.abc import Callable, Iterable, Iterator
 from datetime import datetime
 from decimal import Decimal
+from typing import Any
 
-from sqlalchemy import DateTime, Numeric, String, select
-from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column
+from sqlalchemy import BigInteger, DateTime, Index, Row, String, bindparam, func, insert, select
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column, raiseload
 
 from app.domain.models import Money, Transaction, TransactionType
-from app.domain.repositories import TransactionRepository
+from app.domain.repositories import STREAM_BATCH_SIZE, TransactionRepository
 
 
 class Base(DeclarativeBase):
@@ -17,60 +18,121 @@ class Base(DeclarativeBase):
 
 class TransactionORM(Base):
     __tablename__ = "transactions"
+    # Composite indexes match the list queries: filter by user, then range/match
+    # and order on the second column without a separate sort step.
+    __table_args__ = (
+        Index("ix_tx_user_occurred", "user_id", "occurred_at"),
+        Index("ix_tx_user_category", "user_id", "category_id"),
+        Index("ix_tx_user_created", "user_id", "created_at"),
+    )
 
     id: Mapped[str] = mapped_column(String, primary_key=True)
-    user_id: Mapped[str] = mapped_column(String, nullable=False, index=True)
+    user_id: Mapped[str] = mapped_column(String, nullable=False)
     type: Mapped[str] = mapped_column(String, nullable=False)
-    amount: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False)
+    # Stored in minor units so SUM() is exact integer arithmetic on every backend.
+    amount_cents: Mapped[int] = mapped_column(BigInteger, nullable=False)
     currency: Mapped[str] = mapped_column(String(3), nullable=False)
-    occurred_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), nullable=False, index=True
-    )
+    occurred_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
-    category_id: Mapped[str | None] = mapped_column(String, nullable=True, index=True)
+    category_id: Mapped[str | None] = mapped_column(String, nullable=True)
     account_id: Mapped[str | None] = mapped_column(String, nullable=True, index=True)
     description: Mapped[str | None] = mapped_column(String(500), nullable=True)
 
 
+# Direct value -> member lookup; avoids the Enum.__call__ protocol per row.
+_TYPE_MAP: dict[str, TransactionType] = {t.value: t for t in TransactionType}
+
+# List queries select plain columns: rows come back as tuples, skipping ORM
+# instance construction and identity-map bookkeeping per row. Since no entities
+# are loaded, those queries cannot trigger lazy (N+1) relationship loads.
+_TRANSACTION_COLUMNS = (
+    TransactionORM.id,
+    TransactionORM.user_id,
+    TransactionORM.type,
+    TransactionORM.amount_cents,
+    TransactionORM.currency,
+    TransactionORM.occurred_at,
+    TransactionORM.created_at,
+    TransactionORM.category_id,
+    TransactionORM.account_id,
+    TransactionORM.description,
+)
+
+# Statements are built once at import and executed with bound parameters, so
+# per-call work is limited to binding values (compiled SQL is cached by SQLAlchemy).
+_LIST_BY_USER = (
+    select(*_TRANSACTION_COLUMNS)
+    .where(TransactionORM.user_id == bindparam("user_id"))
+    .order_by(TransactionORM.created_at.desc())
+)
+_ITER_BY_USER = _LIST_BY_USER.execution_options(yield_per=STREAM_BATCH_SIZE)
+_LIST_BY_USER_AND_CATEGORIES = (
+    select(*_TRANSACTION_COLUMNS)
+    .where(TransactionORM.user_id == bindparam("user_id"))
+    .where(TransactionORM.category_id.in_(bindparam("category_ids", expanding=True)))
+    .order_by(TransactionORM.created_at.desc())
+)
+_LIST_BY_USER_AND_PERIOD = (
+    select(*_TRANSACTION_COLUMNS)
+    .where(TransactionORM.user_id == bindparam("user_id"))
+    .where(TransactionORM.occurred_at >= bindparam("start_at"))
+    .where(TransactionORM.occurred_at <= bindparam("end_at"))
+    .order_by(TransactionORM.occurred_at.desc())
+)
+_SUM_EXPENSE_BY_CATEGORIES = (
+    select(TransactionORM.category_id, func.sum(TransactionORM.amount_cents))
+    .where(TransactionORM.user_id == bindparam("user_id"))
+    .where(TransactionORM.type == TransactionType.expense.value)
+    .where(TransactionORM.category_id.in_(bindparam("category_ids", expanding=True)))
+    .group_by(TransactionORM.category_id)
+)
+_SUM_EXPENSE_BY_PERIOD = (
+    select(TransactionORM.category_id, func.sum(TransactionORM.amount_cents))
+    .where(TransactionORM.user_id == bindparam("user_id"))
+    .where(TransactionORM.type == TransactionType.expense.value)
+    .where(TransactionORM.occurred_at >= bindparam("start_at"))
+    .where(TransactionORM.occurred_at <= bindparam("end_at"))
+    .group_by(TransactionORM.category_id)
+)
+
+
 class SQLAlchemyTransactionRepository(TransactionRepository):
     def __init__(self, *, session_factory: Callable[[], Session]) -> None:
         self._session_factory = session_factory
 
     def add(self, tx: Transaction) -> None:
-        # Domain -> DB conversion
-        row = TransactionORM(
-            id=tx.id,
-            user_id=tx.user_id,
-            type=tx.type.value,
-            amount=tx.money.amount,
-            currency=tx.money.currency,
-            occurred_at=tx.occurred_at,
-            created_at=tx.created_at,
-            category_id=tx.category_id,
-            account_id=tx.account_id,
-            description=tx.description,
-        )
-        with self._session_factory() as session:
-            session.add(row)
-            session.commit()
+        row = TransactionORM(**self._to_values(tx))
+        session = self._session_factory()
+        session.add(row)
+        self._commit(session)
+
+    def add_many(self, txs: Iterable[Transaction]) -> None:
+        values = [self._to_values(tx) for tx in txs]
+        if not values:
+            return
+        session = self._session_factory()
+        # One executemany INSERT and a single commit for the whole batch.
+        session.execute(insert(TransactionORM), values)
+        self._commit(session)
 
     def get(self, transaction_id: str) -> Transaction | None:
-        with self._session_factory() as session:
-            row = session.get(TransactionORM, transaction_id)
-            if row is None:
-                return None
-            # DB -> Domain conversion
-            return self._to_domain(row)
+        session = self._session_factory()
+        # Any relationship added later must be loaded explicitly, never lazily per row.
+        row = session.get(TransactionORM, transaction_id, options=[raiseload("*")])
+        if row is None:
+            return None
+        # DB -> Domain conversion
+        return self._to_domain(row)
 
     def list_by_user(self, user_id: str) -> list[Transaction]:
-        with self._session_factory() as session:
-            stmt = (
-                select(TransactionORM)
-                .where(TransactionORM.user_id == user_id)
-                .order_by(TransactionORM.created_at.desc())
-            )
-            rows = session.execute(stmt).scalars().all()
-            return [self._to_domain(row) for row in rows]
+        session = self._session_factory()
+        rows = session.execute(_LIST_BY_USER, {"user_id": user_id}).all()
+        return [self._to_domain(row) for row in rows]
+
+    def iter_by_user(self, user_id: str) -> Iterator[Transaction]:
+        session = self._session_factory()
+        for row in session.execute(_ITER_BY_USER, {"user_id": user_id}):
+            yield self._to_domain(row)
 
     def list_by_user_and_categories(
         self,
@@ -80,15 +142,11 @@ class SQLAlchemyTransactionRepository(TransactionRepository):
     ) -> list[Transaction]:
         if not category_ids:
             return []
-        with self._session_factory() as session:
-            stmt = (
-                select(TransactionORM)
-                .where(TransactionORM.user_id == user_id)
-                .where(TransactionORM.category_id.in_(category_ids))
-                .order_by(TransactionORM.created_at.desc())
-            )
-            rows = session.execute(stmt).scalars().all()
-            return [self._to_domain(row) for row in rows]
+        session = self._session_factory()
+        rows = session.execute(
+            _LIST_BY_USER_AND_CATEGORIES, {"user_id": user_id, "category_ids": category_ids}
+        ).all()
+        return [self._to_domain(row) for row in rows]
 
     def list_by_user_and_period(
         self,
@@ -97,24 +155,78 @@ class SQLAlchemyTransactionRepository(TransactionRepository):
         start_at: datetime,
         end_at: datetime,
     ) -> list[Transaction]:
-        with self._session_factory() as session:
-            stmt = (
-                select(TransactionORM)
-                .where(TransactionORM.user_id == user_id)
-                .where(TransactionORM.occurred_at >= start_at)
-                .where(TransactionORM.occurred_at <= end_at)
-                .order_by(TransactionORM.occurred_at.desc())
-            )
-            rows = session.execute(stmt).scalars().all()
-            return [self._to_domain(row) for row in rows]
+        session = self._session_factory()
+        rows = session.execute(
+            _LIST_BY_USER_AND_PERIOD, {"user_id": user_id, "start_at": start_at, "end_at": end_at}
+        ).all()
+        return [self._to_domain(row) for row in rows]
+
+    def aggregate_expense_by_categories(
+        self,
+        *,
+        user_id: str,
+        category_ids: list[str],
+    ) -> dict[str, Decimal]:
+        if not category_ids:
+            return {}
+        session = self._session_factory()
+        rows = session.execute(
+            _SUM_EXPENSE_BY_CATEGORIES, {"user_id": user_id, "category_ids": category_ids}
+        ).tuples()
+        return {
+            category_id: Money.amount_from_cents(total_cents)
+            for category_id, total_cents in rows
+            if category_id is not None
+        }
+
+    def aggregate_expense_by_period(
+        self,
+        *,
+        user_id: str,
+        start_at: datetime,
+        end_at: datetime,
+    ) -> dict[str | None, Decimal]:
+        session = self._session_factory()
+        rows = session.execute(
+            _SUM_EXPENSE_BY_PERIOD, {"user_id": user_id, "start_at": start_at, "end_at": end_at}
+        ).tuples()
+        return {
+            category_id: Money.amount_from_cents(total_cents) for category_id, total_cents in rows
+        }
+
+    @staticmethod
+    def _commit(session: Session) -> None:
+        try:
+            session.commit()
+        except Exception:
+            # Keep the shared request session usable for later calls.
+            session.rollback()
+            raise
+
+    @staticmethod
+    def _to_values(tx: Transaction) -> dict[str, Any]:
+        # Domain -> DB conversion
+        return {
+            "id": tx.id,
+            "user_id": tx.user_id,
+            "type": tx.type.value,
+            "amount_cents": tx.money.cents,
+            "currency": tx.money.currency,
+            "occurred_at": tx.occurred_at,
+            "created_at": tx.created_at,
+            "category_id": tx.category_id,
+            "account_id": tx.account_id,
+            "description": tx.description,
+        }
 
     @staticmethod
-    def _to_domain(row: TransactionORM) -> Transaction:
+    def _to_domain(row: TransactionORM | Row[Any]) -> Transaction:
         return Transaction(
             id=row.id,
             user_id=row.user_id,
-            type=TransactionType(row.type),
-            money=Money(amount=row.amount, currency=row.currency),
+            type=_TYPE_MAP[row.type],
+            # Values were validated on write; don't re-run Money checks per row.
+            money=Money._unchecked(row.amount_cents, row.currency),
             occurred_at=row.occurred_at,
             created_at=row.created_at,
             category_id=row.category_id,
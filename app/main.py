@@ -2,26 +2,46 @@ from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
+from starlette_exporter import PrometheusMiddleware, handle_metrics
 
+from app.api.middleware import DBSessionMiddleware
+from app.api.responses import AppJSONResponse
 from app.api.routes.transactions import router as transactions_router
-from app.infrastructure.db import init_db, shutdown_db
+from app.application.services.transaction_service import TransactionService
+from app.infrastructure.cache import InMemoryQueryCache
+from app.infrastructure.db import get_session_factory, init_db, shutdown_db
+from app.infrastructure.repositories.transaction_repo_sqlalchemy import (
+    SQLAlchemyTransactionRepository,
+)
+
+API_PREFIX = "/api"
 
 
 @asynccontextmanager
-async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     init_db()
+    app.state.transaction_service = TransactionService(
+        repo=SQLAlchemyTransactionRepository(session_factory=get_session_factory()),
+        cache=InMemoryQueryCache(ttl_seconds=60),
+    )
     yield
     shutdown_db()
 
 
 def create_app() -> FastAPI:
-    app = FastAPI(title="Expense Tracker API", version="0.1.0", lifespan=lifespan)
-
-    # Observability hook:
-    # - Here we can add middleware for request logging, metrics (Prometheus), and tracing (OpenTelemetry).
-    # - Example: add a middleware that records latency and status code per endpoint.
-
-    app.include_router(transactions_router, prefix="/api")
+    app = FastAPI(
+        title="Expense Tracker API",
+        version="0.1.0",
+        lifespan=lifespan,
+        default_response_class=AppJSONResponse,
+    )
+
+    app.add_middleware(DBSessionMiddleware, path_prefix=API_PREFIX)
+    # Request count/latency per route template and status code, recorded once per
+    # request at the transport layer rather than inside the services.
+    app.add_middleware(PrometheusMiddleware, app_name="expense_tracker", group_paths=True)
+    app.add_route("/metrics", handle_metrics)
+    app.include_router(transactions_router, prefix=API_PREFIX)
     return app
 
 
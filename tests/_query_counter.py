@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from sqlalchemy import Connection, Engine, event
+
+
+@contextmanager
+def count_queries(conn: Connection | Engine) -> Iterator[list[str]]:
+    """
+    Collect every SQL statement sent to the DBAPI cursor while the block runs.
+    """
+    queries: list[str] = []
+
+    def _before_cursor_execute(
+        _conn: Connection,
+        _cursor: Any,
+        statement: str,
+        _parameters: Any,
+        _context: Any,
+        _executemany: bool,
+    ) -> None:
+        queries.append(statement)
+
+    event.listen(conn, "before_cursor_execute", _before_cursor_execute)
+    try:
+        yield queries
+    finally:
+        event.remove(conn, "before_cursor_execute", _before_cursor_execute)
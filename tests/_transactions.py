@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from datetime import UTC, datetime
+from decimal import Decimal
+from functools import cache
+from itertools import chain
+from operator import attrgetter
+from typing import Any
+
+from app.domain.models import Money, Transaction, TransactionType
+from app.domain.repositories import TransactionRepository
+
+_occurred_at = attrgetter("occurred_at")
+
+# Shared timestamps: noon on every day of January 2026 plus the month's bounds.
+JAN = {day: datetime(2026, 1, day, 12, 0, tzinfo=UTC) for day in range(1, 32)}
+FEB_1 = datetime(2026, 2, 1, 12, 0, tzinfo=UTC)
+JAN_START = datetime(2026, 1, 1, tzinfo=UTC)
+JAN_END = datetime(2026, 1, 31, 23, 59, tzinfo=UTC)
+FEB_START = datetime(2026, 2, 1, tzinfo=UTC)
+
+# Field values for make_tx(); keys match the service's record_transaction() arguments.
+TX_DEFAULTS: dict[str, Any] = {
+    "user_id": "u1",
+    "tx_type": "expense",
+    "amount": "10",
+    "currency": "RUB",
+    "occurred_at": JAN[10],
+    "category_id": None,
+    "account_id": None,
+    "description": None,
+}
+
+
+@cache
+def make_money(amount: str, currency: str) -> Money:
+    # Money is frozen, so one validated instance per value is shared by all tests.
+    return Money(amount=Decimal(amount), currency=currency)
+
+
+def make_tx(**overrides: Any) -> Transaction:
+    fields = {**TX_DEFAULTS, **overrides}
+    money = make_money(fields.pop("amount"), fields.pop("currency"))
+    return Transaction.create(type=TransactionType(fields.pop("tx_type")), money=money, **fields)
+
+
+class InMemoryTransactionRepository(TransactionRepository):
+    """
+    Dict-backed repository for service and API tests, indexed like the SQL one.
+    """
+
+    def __init__(self) -> None:
+        self._items: dict[str, Transaction] = {}
+        self._by_user: dict[str, list[Transaction]] = defaultdict(list)
+        self._by_user_cat: dict[tuple[str, str | None], list[Transaction]] = defaultdict(list)
+        # Per-user transactions kept sorted by occurred_at for bisect range lookups.
+        self._by_user_time: dict[str, list[Transaction]] = defaultdict(list)
+
+    def add(self, tx: Transaction) -> None:
+        self._items[tx.id] = tx
+        self._by_user[tx.user_id].append(tx)
+        self._by_user_cat[(tx.user_id, tx.category_id)].append(tx)
+        insort(self._by_user_time[tx.user_id], tx, key=_occurred_at)
+
+    def add_many(self, txs: Iterable[Transaction]) -> None:
+        for tx in txs:
+            self.add(tx)
+
+    def get(self, transaction_id: str) -> Transaction | None:
+        return self._items.get(transaction_id)
+
+    def list_by_user(self, user_id: str) -> list[Transaction]:
+        return list(self._by_user.get(user_id, ()))
+
+    def iter_by_user(self, user_id: str) -> Iterator[Transaction]:
+        return iter(self.list_by_user(user_id))
+
+    def list_by_user_and_categories(
+        self,
+        *,
+        user_id: str,
+        category_ids: list[str],
+    ) -> list[Transaction]:
+        return list(
+            chain.from_iterable(
+                self._by_user_cat.get((user_id, category_id), ())
+                for category_id in dict.fromkeys(category_ids)
+            )
+        )
+
+    def list_by_user_and_period(
+        self,
+        *,
+        user_id: str,
+        start_at: datetime,
+        end_at: datetime,
+    ) -> list[Transaction]:
+        by_time = self._by_user_time.get(user_id, [])
+        lo = bisect_left(by_time, start_at, key=_occurred_at)
+        hi = bisect_right(by_time, end_at, key=_occurred_at)
+        return by_time[lo:hi]
+
+    def aggregate_expense_by_categories(
+        self,
+        *,
+        user_id: str,
+        category_ids: list[str],
+    ) -> dict[str, Decimal]:
+        totals: defaultdict[str, Decimal] = defaultdict(Decimal)
+        for tx in self.list_by_user_and_categories(user_id=user_id, category_ids=category_ids):
+            if tx.type == TransactionType.expense and tx.category_id is not None:
+                totals[tx.category_id] += tx.money.amount
+        return dict(totals)
+
+    def aggregate_expense_by_period(
+        self,
+        *,
+        user_id: str,
+        start_at: datetime,
+        end_at: datetime,
+    ) -> dict[str | None, Decimal]:
+        totals: defaultdict[str | None, Decimal] = defaultdict(Decimal)
+        for tx in self.list_by_user_and_period(user_id=user_id, start_at=start_at, end_at=end_at):
+            if tx.type == TransactionType.expense:
+                totals[tx.category_id] += tx.money.amount
+        return dict(totals)
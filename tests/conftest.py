@@ -3,6 +3,28 @@ from __future__ import annotations
 import sys
 from pathlib import Path
 
+import pytest
+
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
+
+from fastapi import FastAPI  # noqa: E402
+
+from app.main import create_app  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def app() -> FastAPI:
+    # Router mounting and middleware setup happen once; tests must not mutate this app.
+    return create_app()
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    # Benchmarks seed 10k rows, which is pure overhead when timing is off (the default).
+    if not config.getoption("benchmark_disable") or config.getoption("benchmark_enable"):
+        return
+    skip = pytest.mark.skip(reason="benchmarks are disabled; run `make bench`")
+    for item in items:
+        if item.get_closest_marker("benchmark") is not None:
+            item.add_marker(skip)
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import json
+from datetime import UTC, datetime
+from decimal import Decimal
+
+import pytest
+
+from app.api.responses import AppJSONResponse, dumps, iter_json_array
+
+
+def test_dumps_matches_pydantic_wire_format() -> None:
+    payload = {"amount": Decimal("10.50"), "at": datetime(2026, 1, 10, 10, 0, tzinfo=UTC)}
+    assert dumps(payload) == b'{"amount":"10.50","at":"2026-01-10T10:00:00Z"}'
+
+
+def test_dumps_rejects_unknown_types() -> None:
+    with pytest.raises(TypeError):
+        dumps({"value": object()})
+
+
+@pytest.mark.parametrize("count", [0, 1, 2, 5])
+def test_iter_json_array_yields_valid_json_in_batches(count: int) -> None:
+    chunks = list(iter_json_array(({"n": n} for n in range(count)), batch_size=2))
+    assert json.loads(b"".join(chunks)) == [{"n": n} for n in range(count)]
+    assert len(chunks) == (count + 1) // 2 + 1
+
+
+def test_app_json_response_renders_with_dumps() -> None:
+    response = AppJSONResponse({"total": Decimal("1.50"), 1: "non-str key"})
+    assert response.body == b'{"total":"1.50","1":"non-str key"}'
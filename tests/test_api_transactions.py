@@ -1,59 +1,23 @@
 from __future__ import annotations
 
 from collections.abc import Generator
-from datetime import datetime
 from decimal import Decimal
 from typing import Any, cast
 
+import orjson
 import pytest
 from fastapi.testclient import TestClient
 
-from app.api.routes.transactions import get_transaction_service
+from app.api.routes.transactions import MAX_BULK_ITEMS, get_transaction_service
 from app.application.services.transaction_service import TransactionService
 from app.domain.errors import DomainValidationError
 from app.domain.models import Transaction
-from app.domain.repositories import TransactionRepository
 from app.main import create_app
 
+from _transactions import InMemoryTransactionRepository
 
-class InMemoryTransactionRepository(TransactionRepository):
-    def __init__(self) -> None:
-        self._items: dict[str, Transaction] = {}
-
-    def add(self, tx: Transaction) -> None:
-        self._items[tx.id] = tx
-
-    def get(self, transaction_id: str) -> Transaction | None:
-        return self._items.get(transaction_id)
-
-    def list_by_user(self, user_id: str) -> list[Transaction]:
-        return [tx for tx in self._items.values() if tx.user_id == user_id]
-
-    def list_by_user_and_categories(
-        self,
-        *,
-        user_id: str,
-        category_ids: list[str],
-    ) -> list[Transaction]:
-        categories = set(category_ids)
-        return [
-            tx
-            for tx in self._items.values()
-            if tx.user_id == user_id and tx.category_id in categories
-        ]
-
-    def list_by_user_and_period(
-        self,
-        *,
-        user_id: str,
-        start_at: datetime,
-        end_at: datetime,
-    ) -> list[Transaction]:
-        return [
-            tx
-            for tx in self._items.values()
-            if tx.user_id == user_id and start_at <= tx.occurred_at <= end_at
-        ]
+# The lifespan calls init_db(); stay on the worker that owns the DB singleton tests.
+pytestmark = pytest.mark.xdist_group("db_singleton")
 
 
 @pytest.fixture
@@ -85,7 +49,7 @@ def _create_transaction(
     }
     response = client.post("/api/transactions", json=payload)
     assert response.status_code == 201
-    return cast(dict[str, Any], response.json())
+    return cast(dict[str, Any], orjson.loads(response.content))
 
 
 def test_create_get_and_list_transactions(test_client: TestClient) -> None:
@@ -106,17 +70,28 @@ def test_create_get_and_list_transactions(test_client: TestClient) -> None:
 
     get_response = test_client.get(f"/api/transactions/{first['id']}")
     assert get_response.status_code == 200
-    assert get_response.json()["id"] == first["id"]
+    fetched = orjson.loads(get_response.content)
+    assert fetched["id"] == first["id"]
 
     list_response = test_client.get("/api/transactions")
     assert list_response.status_code == 200
-    assert len(list_response.json()) == 2
+    items = orjson.loads(list_response.content)
+    assert len(items) == 2
+    listed = {item["id"]: item for item in items}
+    assert listed[first["id"]] == fetched
+
+
+def test_list_transactions_streams_empty_array(test_client: TestClient) -> None:
+    response = test_client.get("/api/transactions")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert orjson.loads(response.content) == []
 
 
 def test_get_transaction_not_found_returns_404(test_client: TestClient) -> None:
     response = test_client.get("/api/transactions/missing-id")
     assert response.status_code == 404
-    assert response.json()["detail"] == "Transaction not found"
+    assert orjson.loads(response.content)["detail"] == "Transaction not found"
 
 
 def test_transactions_by_categories_returns_totals(test_client: TestClient) -> None:
@@ -147,7 +122,7 @@ def test_transactions_by_categories_returns_totals(test_client: TestClient) -> N
         params=[("category_ids", "food"), ("category_ids", "transport")],
     )
     assert response.status_code == 200
-    payload = response.json()
+    payload = orjson.loads(response.content)
     assert payload["total_expense"] == "140.00"
     by_category = {
         item["category_id"]: item["total_expense"] for item in payload["expense_by_category"]
@@ -187,7 +162,7 @@ def test_transactions_by_period_returns_totals(test_client: TestClient) -> None:
         },
     )
     assert response.status_code == 200
-    payload = response.json()
+    payload = orjson.loads(response.content)
     assert payload["total_expense"] == "140.00"
     by_category = {
         item["category_id"]: item["total_expense"] for item in payload["expense_by_category"]
@@ -205,7 +180,7 @@ def test_transactions_by_period_invalid_range_returns_422(test_client: TestClien
         },
     )
     assert response.status_code == 422
-    assert response.json()["detail"] == "start_at must be before or equal to end_at"
+    assert orjson.loads(response.content)["detail"] == "start_at must be before or equal to end_at"
 
 
 def test_create_transaction_maps_domain_error_to_422() -> None:
@@ -228,7 +203,7 @@ def test_create_transaction_maps_domain_error_to_422() -> None:
     app.dependency_overrides.clear()
 
     assert response.status_code == 422
-    assert response.json()["detail"] == "forced domain error"
+    assert orjson.loads(response.content)["detail"] == "forced domain error"
 
 
 def test_transactions_by_categories_maps_domain_error_to_422() -> None:
@@ -252,4 +227,69 @@ def test_transactions_by_categories_maps_domain_error_to_422() -> None:
     app.dependency_overrides.clear()
 
     assert response.status_code == 422
-    assert response.json()["detail"] == "forced category error"
+    assert orjson.loads(response.content)["detail"] == "forced category error"
+
+
+def test_create_transaction_rejects_unknown_fields(test_client: TestClient) -> None:
+    response = test_client.post(
+        "/api/transactions",
+        json={
+            "type": "expense",
+            "amount": "1.00",
+            "occurred_at": "2026-01-10T10:00:00Z",
+            "user_id": "someone-else",
+        },
+    )
+    assert response.status_code == 422
+    assert orjson.loads(response.content)["detail"][0]["type"] == "extra_forbidden"
+
+
+def test_create_transactions_bulk(test_client: TestClient) -> None:
+    item = {"type": "expense", "currency": "RUB", "occurred_at": "2026-01-10T10:00:00Z"}
+    response = test_client.post(
+        "/api/transactions/bulk",
+        json=[{**item, "amount": "10.00"}, {**item, "amount": "5.00", "category_id": "food"}],
+    )
+    assert response.status_code == 201
+    created = orjson.loads(response.content)
+    assert [tx["amount"] for tx in created] == ["10.00", "5.00"]
+
+    listed = orjson.loads(test_client.get("/api/transactions").content)
+    assert {tx["id"] for tx in listed} == {tx["id"] for tx in created}
+
+    invalid = test_client.post(
+        "/api/transactions/bulk",
+        json=[{**item, "amount": "1.00", "currency": "RUBLE"}],
+    )
+    assert invalid.status_code == 422
+
+
+def test_create_transactions_bulk_rejects_oversized_batch(test_client: TestClient) -> None:
+    item = {"type": "expense", "amount": "1.00", "occurred_at": "2026-01-10T10:00:00Z"}
+    response = test_client.post("/api/transactions/bulk", json=[item] * (MAX_BULK_ITEMS + 1))
+    assert response.status_code == 422
+    assert orjson.loads(response.content)["detail"][0]["type"] == "too_long"
+    assert orjson.loads(test_client.get("/api/transactions").content) == []
+
+
+def test_create_transaction_rejects_amount_beyond_storage_range(test_client: TestClient) -> None:
+    response = test_client.post(
+        "/api/transactions",
+        json={
+            "type": "expense",
+            "amount": "99999999999999999999",
+            "occurred_at": "2026-01-10T10:00:00Z",
+        },
+    )
+    assert response.status_code == 422
+    assert orjson.loads(response.content)["detail"] == "Amount must not exceed 9999999999.99"
+
+
+def test_create_transactions_bulk_maps_domain_error_to_422(test_client: TestClient) -> None:
+    response = test_client.post(
+        "/api/transactions/bulk",
+        json=[{"type": "expense", "amount": "1.005", "occurred_at": "2026-01-10T10:00:00Z"}],
+    )
+    assert response.status_code == 422
+    assert orjson.loads(response.content)["detail"] == "Amount must have at most 2 decimal places"
+    assert orjson.loads(test_client.get("/api/transactions").content) == []
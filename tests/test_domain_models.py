@@ -1,44 +1,70 @@
 from __future__ import annotations
 
-from datetime import UTC, datetime
+import re
+from datetime import datetime
 from decimal import Decimal
+from uuid import UUID
 
 import pytest
 
 from app.domain.errors import DomainValidationError
-from app.domain.models import Money, Transaction, TransactionType
+from app.domain.models import MAX_AMOUNT, Money, Transaction, TransactionType, uuid7
 
+from _transactions import JAN_START
 
-def test_money_rejects_zero_amount() -> None:
-    with pytest.raises(DomainValidationError, match="Amount must be greater than 0"):
-        Money(amount=Decimal("0"), currency="RUB")
+_AMOUNT_RE = re.compile("Amount must be greater than 0")
+_MAX_AMOUNT_RE = re.compile("Amount must not exceed")
+_CURRENCY_RE = re.compile("Currency must be a 3-letter code")
+_PRECISION_RE = re.compile("at most 2 decimal places")
+_USER_ID_RE = re.compile("user_id is required")
+_TIMEZONE_RE = re.compile("occurred_at must be timezone-aware")
 
+ONE_RUB = Money(amount=Decimal("1"), currency="RUB")
 
-def test_money_rejects_invalid_currency() -> None:
-    with pytest.raises(DomainValidationError, match="Currency must be a 3-letter code"):
-        Money(amount=Decimal("1"), currency="RU")
 
+@pytest.mark.parametrize(
+    ("amount", "currency", "match"),
+    [
+        (Decimal("0"), "RUB", _AMOUNT_RE),
+        (MAX_AMOUNT + Decimal("0.01"), "RUB", _MAX_AMOUNT_RE),
+        (Decimal("1"), "RU", _CURRENCY_RE),
+        (Decimal("1.005"), "RUB", _PRECISION_RE),
+    ],
+)
+def test_money_invalid(amount: Decimal, currency: str, match: re.Pattern[str]) -> None:
+    with pytest.raises(DomainValidationError, match=match):
+        Money(amount=amount, currency=currency)
 
-def test_transaction_create_requires_user_id() -> None:
-    with pytest.raises(DomainValidationError, match="user_id is required"):
-        Transaction.create(
-            user_id="",
-            type=TransactionType.expense,
-            money=Money(amount=Decimal("1"), currency="RUB"),
-            occurred_at=datetime(2026, 1, 1, tzinfo=UTC),
-            category_id=None,
-            account_id=None,
-            description=None,
-        )
+
+def test_money_converts_to_and_from_cents() -> None:
+    money = Money(amount=Decimal("15.5"), currency="RUB")
+    assert money.cents == 1550
+    assert str(Money.amount_from_cents(money.cents)) == "15.50"
 
 
-def test_transaction_create_requires_timezone_aware_datetime() -> None:
-    with pytest.raises(DomainValidationError, match="occurred_at must be timezone-aware"):
+def test_money_unchecked_matches_validated_money() -> None:
+    money = Money._unchecked(1550, "RUB")
+    assert money == Money(amount=Decimal("15.50"), currency="RUB")
+    assert money.cents == 1550
+    assert str(money.amount) == "15.50"
+
+
+@pytest.mark.parametrize(
+    ("user_id", "occurred_at", "match"),
+    [
+        ("", JAN_START, _USER_ID_RE),
+        ("u1", JAN_START.replace(tzinfo=None), _TIMEZONE_RE),
+    ],
+)
+def test_transaction_create_invalid(
+    user_id: str, occurred_at: datetime, match: re.Pattern[str]
+) -> None:
+    with pytest.raises(DomainValidationError, match=match):
         Transaction.create(
-            user_id="u1",
+            user_id=user_id,
             type=TransactionType.expense,
-            money=Money(amount=Decimal("1"), currency="RUB"),
-            occurred_at=datetime(2026, 1, 1),
+            money=ONE_RUB,
+            occurred_at=occurred_at,
             category_id=None,
             account_id=None,
             description=None,
@@ -50,7 +76,7 @@ def test_transaction_create_success() -> None:
         user_id="u1",
         type=TransactionType.income,
         money=Money(amount=Decimal("15.50"), currency="RUB"),
-        occurred_at=datetime(2026, 1, 1, tzinfo=UTC),
+        occurred_at=JAN_START,
         category_id="salary",
         account_id="card",
         description="salary",
@@ -61,3 +87,16 @@ def test_transaction_create_success() -> None:
     assert tx.type == TransactionType.income
     assert tx.money.amount == Decimal("15.50")
     assert tx.created_at.tzinfo is not None
+
+
+def test_uuid7_is_version_7_and_time_ordered(monkeypatch: pytest.MonkeyPatch) -> None:
+    now_ns = iter([1_700_000_000_000_000_000, 1_700_000_000_001_000_000])
+    monkeypatch.setattr("app.domain.models.time_ns", lambda: next(now_ns))
+
+    first, second = uuid7(), uuid7()
+
+    parsed = UUID(first)
+    assert parsed.version == 7
+    assert parsed.variant == "specified in RFC 4122"
+    assert parsed.int >> 80 == 1_700_000_000_000
+    assert first < second
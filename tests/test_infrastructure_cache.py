@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from app.infrastructure.cache import InMemoryQueryCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_cache_returns_value_until_ttl_expires() -> None:
+    clock = FakeClock()
+    cache = InMemoryQueryCache(ttl_seconds=10, clock=clock)
+    cache.set("u1", "k", "value")
+
+    clock.now = 9.9
+    assert cache.get("u1", "k") == "value"
+    clock.now = 10.0
+    assert cache.get("u1", "k") is None
+    assert cache.get("u1", "missing") is None
+
+
+def test_cache_evicts_least_recently_used_entry() -> None:
+    cache = InMemoryQueryCache(max_entries=2)
+    cache.set("u1", "a", 1)
+    cache.set("u1", "b", 2)
+    assert cache.get("u1", "a") == 1
+
+    cache.set("u1", "c", 3)
+
+    assert cache.get("u1", "a") == 1
+    assert cache.get("u1", "b") is None
+    assert cache.get("u1", "c") == 3
+
+
+def test_cache_invalidate_drops_only_given_scope() -> None:
+    cache = InMemoryQueryCache()
+    cache.set("u1", "a", 1)
+    cache.set("u1", "b", 2)
+    cache.set("u2", "a", 3)
+
+    cache.invalidate("u1")
+
+    assert cache.get("u1", "a") is None
+    assert cache.get("u1", "b") is None
+    assert cache.get("u2", "a") == 3
+
+
+def test_cache_set_skips_value_read_before_invalidation() -> None:
+    cache = InMemoryQueryCache()
+    stale = cache.generation("u1")
+    cache.invalidate("u1")
+
+    cache.set("u1", "k", "stale", generation=stale)
+    assert cache.get("u1", "k") is None
+
+    cache.set("u1", "k", "fresh", generation=cache.generation("u1"))
+    assert cache.get("u1", "k") == "fresh"
@@ -1,29 +1,159 @@
 from __future__ import annotations
 
+import threading
+from pathlib import Path
+
+import anyio
+import httpx
+import pytest
+from anyio import to_thread
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.testclient import TestClient
 from starlette.routing import Route
+from starlette.types import Message, Scope
 
-from app.main import create_app
+import app.infrastructure.db as db
+from app.api.middleware import DBSessionMiddleware
+from app.api.responses import AppJSONResponse
+from app.api.routes.transactions import get_transaction_service
+from app.application.services.transaction_service import TransactionService
+from app.main import create_app, lifespan
 
+# The lifespan calls init_db(); stay on the worker that owns the DB singleton tests.
+pytestmark = pytest.mark.xdist_group("db_singleton")
 
-def test_create_app_has_expected_metadata_and_routes() -> None:
-    app = create_app()
+
+def test_create_app_has_expected_metadata_and_routes(app: FastAPI) -> None:
     assert app.title == "Expense Tracker API"
     assert app.version == "0.1.0"
+    assert app.router.default_response_class is AppJSONResponse
     paths = {route.path for route in app.routes if isinstance(route, Route)}
     assert "/api/transactions" in paths
     assert "/api/transactions/{transaction_id}" in paths
     assert "/api/transactions/by-categories" in paths
     assert "/api/transactions/by-period" in paths
+    assert "/api/transactions/bulk" in paths
+    assert any(m.cls is DBSessionMiddleware for m in app.user_middleware)
+
+
+def _get_status(app: FastAPI, path: str) -> int:
+    # Drive the ASGI app directly: status-only probes need no HTTP client or lifespan.
+    messages: list[Message] = []
+
+    async def receive() -> Message:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Message) -> None:
+        messages.append(message)
+
+    scope: Scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+        "client": ("testclient", 50000),
+        "server": ("testserver", 80),
+    }
+    anyio.run(app, scope, receive, send)
+    start = next(m for m in messages if m["type"] == "http.response.start")
+    return int(start["status"])
+
+
+def test_docs_endpoint_is_available(app: FastAPI) -> None:
+    assert _get_status(app, "/docs") == 200
+
+
+def test_root_is_not_implemented_for_mvp(app: FastAPI) -> None:
+    assert _get_status(app, "/") == 404
+
+
+def test_lifespan_builds_a_single_transaction_service() -> None:
+    app = create_app()
+    with TestClient(app):
+        service = app.state.transaction_service
+        assert isinstance(service, TransactionService)
+        request = Request({"type": "http", "app": app})
+        assert get_transaction_service(request) is service
 
 
-def test_docs_endpoint_is_available() -> None:
+def test_requests_beyond_pool_capacity_queue_instead_of_timing_out(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # Worst case for a sync stack: as many worker threads as connections. Requests
+    # waiting on pool checkout must not take the threads the connection holders need
+    # to finish their (streamed) responses.
+    monkeypatch.setattr(db, "POOL_SIZE", 2)
+    monkeypatch.setattr(db, "MAX_OVERFLOW", 0)
+    monkeypatch.setattr(db, "POOL_TIMEOUT_SECONDS", 2)
+    db.shutdown_db()
+    db.init_db(f"sqlite:///{tmp_path / 'concurrency.db'}")
+    app = create_app()
+
+    async def run() -> list[int]:
+        to_thread.current_default_thread_limiter().total_tokens = db.pool_capacity()
+        statuses: list[int] = []
+
+        async def fetch(client: httpx.AsyncClient) -> None:
+            statuses.append((await client.get("/api/transactions")).status_code)
+
+        async with lifespan(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                with anyio.fail_after(10):
+                    async with anyio.create_task_group() as tg:
+                        for _ in range(20):
+                            tg.start_soon(fetch, client)
+        return statuses
+
+    assert anyio.run(run) == [200] * 20
+
+
+def test_metrics_endpoint_exposes_request_metrics() -> None:
     with TestClient(create_app()) as client:
-        response = client.get("/docs")
+        client.get("/api/transactions/missing-id")
+        response = client.get("/metrics")
     assert response.status_code == 200
+    assert 'path="/api/transactions/{transaction_id}"' in response.text
+    assert "expense_tracker" in response.text
 
 
-def test_root_is_not_implemented_for_mvp() -> None:
-    with TestClient(create_app()) as client:
-        response = client.get("/")
-    assert response.status_code == 404
+def test_metrics_answer_while_api_requests_hold_every_permit(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(db, "POOL_SIZE", 1)
+    monkeypatch.setattr(db, "MAX_OVERFLOW", 0)
+    app = create_app()
+    entered, release = threading.Event(), threading.Event()
+
+    def _blocking_service() -> TransactionService:
+        entered.set()
+        release.wait()
+        raise HTTPException(status_code=503)
+
+    app.dependency_overrides[get_transaction_service] = _blocking_service
+
+    async def run() -> tuple[int, int]:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            api_statuses: list[int] = []
+
+            async def hold_permit() -> None:
+                api_statuses.append((await client.get("/api/transactions")).status_code)
+
+            async with anyio.create_task_group() as tg:
+                tg.start_soon(hold_permit)
+                try:
+                    await to_thread.run_sync(entered.wait)
+                    with anyio.fail_after(2):
+                        metrics = await client.get("/metrics")
+                finally:
+                    release.set()
+        return metrics.status_code, api_statuses[0]
+
+    assert anyio.run(run) == (200, 503)
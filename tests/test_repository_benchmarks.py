@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from collections.abc import Generator
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+from sqlalchemy import Engine
+from sqlalchemy.orm import sessionmaker
+
+from app.domain.models import Money, Transaction, TransactionType
+from app.infrastructure.db import create_db_engine
+from app.infrastructure.repositories.transaction_repo_sqlalchemy import (
+    SQLAlchemyTransactionRepository,
+)
+
+from _transactions import JAN_START
+
+# Benchmarks only run with --benchmark-enable (see `make bench`); in the regular run
+# conftest skips them so the 10k-row seed is never built. addopts also sets
+# --benchmark-disable-gc, so collector pauses stay out of the timed rounds.
+pytestmark = pytest.mark.benchmark(group="repo-list")
+
+SEED_ROWS = 10_000
+USERS = [f"u{i}" for i in range(10)]
+ROWS_PER_USER = SEED_ROWS // len(USERS)
+CATEGORIES = ["food", "transport", "health", "fun", "home"]
+# One timestamp per hour, shared by all users: row i of a user lands on HOURS[i].
+HOURS = [JAN_START + timedelta(hours=hour) for hour in range(ROWS_PER_USER)]
+WEEK_END = JAN_START + timedelta(days=7)
+
+
+@pytest.fixture(scope="module")
+def engine() -> Generator[Engine, None, None]:
+    # A private in-memory database, seeded once for the whole module.
+    db_engine = create_db_engine("sqlite:///:memory:")
+    yield db_engine
+    db_engine.dispose()
+
+
+@pytest.fixture(scope="module")
+def repo(engine: Engine) -> Generator[SQLAlchemyTransactionRepository, None, None]:
+    session = sessionmaker(bind=engine, expire_on_commit=False)()
+    repository = SQLAlchemyTransactionRepository(session_factory=lambda: session)
+    money = Money(amount=Decimal("10.00"), currency="RUB")
+    repository.add_many(
+        Transaction.create(
+            user_id=USERS[i % len(USERS)],
+            type=TransactionType.expense if i % 4 else TransactionType.income,
+            money=money,
+            occurred_at=HOURS[i // len(USERS)],
+            category_id=CATEGORIES[i % len(CATEGORIES)],
+            account_id=None,
+            description=None,
+        )
+        for i in range(SEED_ROWS)
+    )
+    yield repository
+    session.close()
+
+
+def test_benchmark_list_by_user(
+    benchmark: BenchmarkFixture, repo: SQLAlchemyTransactionRepository
+) -> None:
+    result = benchmark(repo.list_by_user, "u1")
+    assert len(result) == ROWS_PER_USER
+
+
+def test_benchmark_list_by_user_and_categories(
+    benchmark: BenchmarkFixture, repo: SQLAlchemyTransactionRepository
+) -> None:
+    # With 10 users and 5 categories cycling together, u1 only ever gets "transport".
+    result = benchmark(
+        repo.list_by_user_and_categories, user_id="u1", category_ids=["food", "transport"]
+    )
+    assert len(result) == ROWS_PER_USER
+
+
+def test_benchmark_list_by_user_and_period(
+    benchmark: BenchmarkFixture, repo: SQLAlchemyTransactionRepository
+) -> None:
+    result = benchmark(
+        repo.list_by_user_and_period,
+        user_id="u1",
+        start_at=JAN_START,
+        end_at=WEEK_END,
+    )
+    assert 0 < len(result) < ROWS_PER_USER
@@ -1,56 +1,72 @@
 from __future__ import annotations
 
 from collections.abc import Generator
-from datetime import UTC, datetime
 from decimal import Decimal
-from pathlib import Path
+from typing import Any
 
 import pytest
+from sqlalchemy import Connection, Engine, event, text
+from sqlalchemy.orm import Session
 
-from app.domain.models import Money, Transaction, TransactionType
-from app.infrastructure.db import get_session_factory, init_db, shutdown_db
+from app.domain.models import TransactionType
+from app.infrastructure.db import create_db_engine
 from app.infrastructure.repositories.transaction_repo_sqlalchemy import (
+    Base,
     SQLAlchemyTransactionRepository,
 )
 
+from _query_counter import count_queries
+from _transactions import FEB_1, JAN, JAN_END, JAN_START, make_tx
+
+
+@pytest.fixture(scope="session")
+def engine() -> Generator[Engine, None, None]:
+    # Engine, pool and schema are created once for the whole test session. The database
+    # lives in memory (one StaticPool connection), so tests never touch the disk.
+    db_engine = create_db_engine("sqlite:///:memory:")
+
+    # pysqlite's own transaction handling breaks SAVEPOINTs; let SQLAlchemy emit BEGIN
+    # itself (the recipe from the SQLAlchemy SQLite dialect docs).
+    @event.listens_for(db_engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection: Any, _record: Any) -> None:
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(db_engine, "begin")
+    def _emit_begin(connection: Connection) -> None:
+        connection.exec_driver_sql("BEGIN")
+
+    # Replace the connection opened before the hooks existed; with :memory: that also
+    # drops the schema, so create it again.
+    db_engine.dispose()
+    Base.metadata.create_all(bind=db_engine)
+    yield db_engine
+    db_engine.dispose()
+
 
 @pytest.fixture
-def repo(tmp_path: Path) -> Generator[SQLAlchemyTransactionRepository, None, None]:
-    shutdown_db()
-    db_url = f"sqlite:///{tmp_path / 'repository.db'}"
-    init_db(db_url)
-    repository = SQLAlchemyTransactionRepository(session_factory=get_session_factory())
-    yield repository
-    shutdown_db()
-
-
-def _build_tx(
-    *,
-    user_id: str,
-    tx_type: TransactionType,
-    amount: str,
-    occurred_at: datetime,
-    category_id: str | None,
-) -> Transaction:
-    return Transaction.create(
-        user_id=user_id,
-        type=tx_type,
-        money=Money(amount=Decimal(amount), currency="RUB"),
-        occurred_at=occurred_at,
-        category_id=category_id,
-        account_id=None,
-        description="repo test",
+def session(engine: Engine) -> Generator[Session, None, None]:
+    # Each test runs inside an outer transaction that is rolled back afterwards;
+    # the repository's commits only release SAVEPOINTs within it.
+    connection = engine.connect()
+    transaction = connection.begin()
+    db_session = Session(
+        bind=connection,
+        join_transaction_mode="create_savepoint",
+        expire_on_commit=False,
     )
+    yield db_session
+    db_session.close()
+    transaction.rollback()
+    connection.close()
+
+
+@pytest.fixture
+def repo(session: Session) -> SQLAlchemyTransactionRepository:
+    return SQLAlchemyTransactionRepository(session_factory=lambda: session)
 
 
 def test_repository_add_and_get(repo: SQLAlchemyTransactionRepository) -> None:
-    tx = _build_tx(
-        user_id="u1",
-        tx_type=TransactionType.expense,
-        amount="123.45",
-        occurred_at=datetime(2026, 1, 1, tzinfo=UTC),
-        category_id="food",
-    )
+    tx = make_tx(amount="123.45")
     repo.add(tx)
 
     saved = repo.get(tx.id)
@@ -61,108 +77,156 @@ def test_repository_add_and_get(repo: SQLAlchemyTransactionRepository) -> None:
     assert repo.get("missing-id") is None
 
 
-def test_repository_list_by_user(repo: SQLAlchemyTransactionRepository) -> None:
-    tx1 = _build_tx(
-        user_id="u1",
-        tx_type=TransactionType.expense,
-        amount="10.00",
-        occurred_at=datetime(2026, 1, 1, tzinfo=UTC),
-        category_id="food",
+# Read-only dataset for the list-filter cases, keyed so expectations can name rows.
+_SEED = {
+    "food": make_tx(category_id="food"),
+    "transport": make_tx(amount="15.00", occurred_at=JAN[2], category_id="transport"),
+    "health": make_tx(amount="25.00", occurred_at=JAN[3], category_id="health"),
+    "salary": make_tx(tx_type="income", amount="20.00", occurred_at=JAN[15], category_id="salary"),
+    "food-feb": make_tx(amount="20.00", occurred_at=FEB_1, category_id="food"),
+    "other-user": make_tx(user_id="u2", amount="30.00", occurred_at=JAN[3]),
+}
+
+
+@pytest.fixture(scope="module")
+def seeded_session() -> Generator[Session, None, None]:
+    # A private in-memory database, so the committed seed never meets the
+    # SAVEPOINT-isolated tests that share the session-wide engine.
+    seed_engine = create_db_engine("sqlite:///:memory:")
+    db_session = Session(bind=seed_engine, expire_on_commit=False)
+    SQLAlchemyTransactionRepository(session_factory=lambda: db_session).add_many(_SEED.values())
+    yield db_session
+    db_session.close()
+    seed_engine.dispose()
+
+
+@pytest.mark.parametrize(
+    ("method", "kwargs", "expected", "query_count"),
+    [
+        (
+            "list_by_user",
+            {"user_id": "u1"},
+            {"food", "transport", "health", "salary", "food-feb"},
+            1,
+        ),
+        (
+            "list_by_user_and_categories",
+            {"user_id": "u1", "category_ids": ["food", "transport"]},
+            {"food", "transport", "food-feb"},
+            1,
+        ),
+        ("list_by_user_and_categories", {"user_id": "u1", "category_ids": []}, set(), 0),
+        (
+            "list_by_user_and_period",
+            {"user_id": "u1", "start_at": JAN_START, "end_at": JAN_END},
+            {"food", "transport", "health", "salary"},
+            1,
+        ),
+    ],
+)
+def test_repository_list_filters(
+    seeded_session: Session,
+    method: str,
+    kwargs: dict[str, Any],
+    expected: set[str],
+    query_count: int,
+) -> None:
+    repo = SQLAlchemyTransactionRepository(session_factory=lambda: seeded_session)
+
+    with count_queries(seeded_session.connection()) as queries:
+        result = getattr(repo, method)(**kwargs)
+
+    assert {tx.id for tx in result} == {_SEED[key].id for key in expected}
+    assert len(queries) == query_count
+
+
+def test_repository_aggregates_expense_in_sql(repo: SQLAlchemyTransactionRepository) -> None:
+    repo.add_many(
+        make_tx(
+            user_id=user_id,
+            tx_type=tx_type,
+            amount=amount,
+            occurred_at=JAN[day],
+            category_id=category_id,
+        )
+        for user_id, tx_type, amount, day, category_id in [
+            ("u1", TransactionType.expense, "10.00", 1, "food"),
+            ("u1", TransactionType.expense, "5.50", 2, "food"),
+            ("u1", TransactionType.income, "99.00", 3, "food"),
+            ("u1", TransactionType.expense, "15.00", 4, "transport"),
+            ("u1", TransactionType.expense, "7.00", 5, None),
+            ("u2", TransactionType.expense, "20.00", 1, "food"),
+        ]
+    )
+
+    by_categories = repo.aggregate_expense_by_categories(
+        user_id="u1", category_ids=["food", "transport", "health"]
     )
-    tx2 = _build_tx(
+    assert by_categories == {"food": Decimal("15.50"), "transport": Decimal("15.00")}
+    assert repo.aggregate_expense_by_categories(user_id="u1", category_ids=[]) == {}
+
+    by_period = repo.aggregate_expense_by_period(
         user_id="u1",
-        tx_type=TransactionType.income,
-        amount="20.00",
-        occurred_at=datetime(2026, 1, 2, tzinfo=UTC),
-        category_id="salary",
+        start_at=JAN[2],
+        end_at=JAN_END,
     )
-    tx3 = _build_tx(
-        user_id="u2",
-        tx_type=TransactionType.expense,
-        amount="30.00",
-        occurred_at=datetime(2026, 1, 3, tzinfo=UTC),
-        category_id="food",
+    assert by_period == {
+        "food": Decimal("5.50"),
+        "transport": Decimal("15.00"),
+        None: Decimal("7.00"),
+    }
+
+
+def test_list_queries_use_composite_indexes(session: Session) -> None:
+    plan = "\n".join(
+        str(row)
+        for row in session.execute(
+            text(
+                "EXPLAIN QUERY PLAN SELECT * FROM transactions "
+                "WHERE user_id = 'u1' AND occurred_at >= '2026-01-01' ORDER BY occurred_at DESC"
+            )
+        )
     )
+    assert "ix_tx_user_occurred" in plan
+    assert "TEMP B-TREE" not in plan
 
-    repo.add(tx1)
-    repo.add(tx2)
-    repo.add(tx3)
 
-    result = repo.list_by_user("u1")
-    assert len(result) == 2
-    assert {tx.user_id for tx in result} == {"u1"}
+def test_repository_iter_by_user_streams_rows(repo: SQLAlchemyTransactionRepository) -> None:
+    repo.add_many(make_tx(occurred_at=JAN[day]) for day in range(1, 4))
 
+    streamed = repo.iter_by_user("u1")
+    assert not isinstance(streamed, list)
+    assert [tx.id for tx in streamed] == [tx.id for tx in repo.list_by_user("u1")]
+    assert list(repo.iter_by_user("u2")) == []
 
-def test_repository_list_by_user_and_categories(repo: SQLAlchemyTransactionRepository) -> None:
-    repo.add(
-        _build_tx(
-            user_id="u1",
-            tx_type=TransactionType.expense,
-            amount="10.00",
-            occurred_at=datetime(2026, 1, 1, tzinfo=UTC),
-            category_id="food",
-        )
-    )
-    repo.add(
-        _build_tx(
-            user_id="u1",
-            tx_type=TransactionType.expense,
-            amount="15.00",
-            occurred_at=datetime(2026, 1, 2, tzinfo=UTC),
-            category_id="transport",
-        )
-    )
-    repo.add(
-        _build_tx(
-            user_id="u1",
-            tx_type=TransactionType.expense,
-            amount="25.00",
-            occurred_at=datetime(2026, 1, 3, tzinfo=UTC),
-            category_id="health",
-        )
-    )
 
-    selected = repo.list_by_user_and_categories(user_id="u1", category_ids=["food", "transport"])
-    assert len(selected) == 2
-    assert {tx.category_id for tx in selected} == {"food", "transport"}
+def test_repository_add_many_inserts_batch(repo: SQLAlchemyTransactionRepository) -> None:
+    txs = [make_tx(amount=f"{day}.25", occurred_at=JAN[day]) for day in range(1, 4)]
+    repo.add_many(txs)
+    repo.add_many([])
 
-    assert repo.list_by_user_and_categories(user_id="u1", category_ids=[]) == []
+    saved = repo.list_by_user("u1")
+    assert {tx.id for tx in saved} == {tx.id for tx in txs}
+    assert sorted(tx.money.amount for tx in saved) == [
+        Decimal("1.25"),
+        Decimal("2.25"),
+        Decimal("3.25"),
+    ]
 
 
-def test_repository_list_by_user_and_period(repo: SQLAlchemyTransactionRepository) -> None:
-    repo.add(
-        _build_tx(
-            user_id="u1",
-            tx_type=TransactionType.expense,
-            amount="10.00",
-            occurred_at=datetime(2026, 1, 1, 10, 0, tzinfo=UTC),
-            category_id="food",
-        )
-    )
-    repo.add(
-        _build_tx(
-            user_id="u1",
-            tx_type=TransactionType.expense,
-            amount="15.00",
-            occurred_at=datetime(2026, 1, 15, 10, 0, tzinfo=UTC),
-            category_id="transport",
-        )
-    )
-    repo.add(
-        _build_tx(
-            user_id="u1",
-            tx_type=TransactionType.expense,
-            amount="20.00",
-            occurred_at=datetime(2026, 2, 1, 10, 0, tzinfo=UTC),
-            category_id="health",
-        )
-    )
+def test_list_queries_do_not_load_orm_entities(
+    repo: SQLAlchemyTransactionRepository, session: Session
+) -> None:
+    repo.add(make_tx(category_id="food"))
+    session.expunge_all()
+
+    assert len(repo.list_by_user("u1")) == 1
+    assert len(repo.list_by_user_and_categories(user_id="u1", category_ids=["food"])) == 1
+    assert len(list(repo.iter_by_user("u1"))) == 1
+    # Nothing entered the identity map, so there is nothing to lazy-load from.
+    assert len(session.identity_map) == 0
 
-    period = repo.list_by_user_and_period(
-        user_id="u1",
-        start_at=datetime(2026, 1, 1, 0, 0, tzinfo=UTC),
-        end_at=datetime(2026, 1, 31, 23, 59, tzinfo=UTC),
-    )
 
-    assert len(period) == 2
-    assert all(tx.occurred_at.month == 1 for tx in period)
+def test_repository_tests_are_isolated(repo: SQLAlchemyTransactionRepository) -> None:
+    # Rows added by earlier tests were rolled back with their outer transaction.
+    assert repo.list_by_user("u1") == []
@@ -1,64 +1,83 @@
-from datetime import UTC, datetime
+import re
+from datetime import UTC
 from decimal import Decimal
+from typing import Any
 
 import pytest
 
-from app.application.services.transaction_service import TransactionService
+from app.application.services.transaction_service import NewTransaction, TransactionService
 from app.domain.errors import DomainValidationError, NotFoundError
 from app.domain.models import Transaction
-from app.domain.repositories import TransactionRepository
-
-
-class InMemoryTransactionRepository(TransactionRepository):
-    def __init__(self) -> None:
-        self._items: dict[str, Transaction] = {}
-
-    def add(self, tx: Transaction) -> None:
-        self._items[tx.id] = tx
-
-    def get(self, transaction_id: str) -> Transaction | None:
-        return self._items.get(transaction_id)
-
-    def list_by_user(self, user_id: str) -> list[Transaction]:
-        return [tx for tx in self._items.values() if tx.user_id == user_id]
-
-    def list_by_user_and_categories(
-        self,
-        *,
-        user_id: str,
-        category_ids: list[str],
-    ) -> list[Transaction]:
-        categories = set(category_ids)
-        return [
-            tx
-            for tx in self._items.values()
-            if tx.user_id == user_id and tx.category_id in categories
-        ]
-
-    def list_by_user_and_period(
-        self,
-        *,
-        user_id: str,
-        start_at: datetime,
-        end_at: datetime,
-    ) -> list[Transaction]:
-        return [
-            tx
-            for tx in self._items.values()
-            if tx.user_id == user_id and start_at <= tx.occurred_at <= end_at
-        ]
-
-
-def test_record_transaction_success() -> None:
-    repo = InMemoryTransactionRepository()
-    service = TransactionService(repo=repo)
-
+from app.infrastructure.cache import InMemoryQueryCache
+
+from _transactions import (
+    FEB_1,
+    FEB_START,
+    JAN,
+    JAN_END,
+    JAN_START,
+    TX_DEFAULTS,
+    InMemoryTransactionRepository,
+    make_tx,
+)
+
+_AMOUNT_RE = re.compile("Amount must be greater than 0")
+_CURRENCY_RE = re.compile("Currency must be a 3-letter code")
+_TX_TYPE_RE = re.compile("Unsupported transaction type: refund")
+
+
+# Overrides for _record(); u1 selects food+transport, u2's row must not leak in.
+_CATEGORY_ROWS: list[dict[str, Any]] = [
+    {"amount": "100", "category_id": "food"},
+    {"tx_type": "income", "amount": "20", "occurred_at": JAN[11], "category_id": "food"},
+    {"amount": "50", "occurred_at": JAN[12], "category_id": "transport"},
+    {"amount": "200", "occurred_at": JAN[13], "category_id": "health"},
+    {"user_id": "u2", "amount": "999", "occurred_at": JAN[14], "category_id": "food"},
+]
+_CATEGORY_TOTAL = Decimal("150")
+_CATEGORY_EXPENSES = {"food": Decimal("100"), "transport": Decimal("50")}
+
+# Overrides for _record(); the January period excludes the income and the February row.
+_PERIOD_ROWS: list[dict[str, Any]] = [
+    {"amount": "100", "occurred_at": JAN[5], "category_id": "food"},
+    {"amount": "40", "occurred_at": JAN[15], "category_id": "transport"},
+    {"tx_type": "income", "amount": "500", "occurred_at": JAN[20], "category_id": "salary"},
+    {"amount": "80", "occurred_at": FEB_1, "category_id": "food"},
+]
+_PERIOD_TOTAL = Decimal("140")
+_PERIOD_EXPENSES = {"food": Decimal("100"), "transport": Decimal("40")}
+
+
+def _record(service: TransactionService, **overrides: Any) -> Transaction:
+    fields = {**TX_DEFAULTS, **overrides}
+    return service.record_transaction(**{**fields, "amount": Decimal(fields["amount"])})
+
+
+@pytest.fixture
+def repo() -> InMemoryTransactionRepository:
+    return InMemoryTransactionRepository()
+
+
+@pytest.fixture
+def service(repo: InMemoryTransactionRepository) -> TransactionService:
+    return TransactionService(repo=repo)
+
+
+@pytest.fixture(scope="module")
+def empty_service() -> TransactionService:
+    # Shared across the module: only for tests that raise before anything is written.
+    return TransactionService(repo=InMemoryTransactionRepository())
+
+
+def test_record_transaction_success(
+    repo: InMemoryTransactionRepository, service: TransactionService
+) -> None:
     tx = service.record_transaction(
         user_id="u1",
         tx_type="expense",
         amount=Decimal("10.50"),
         currency="RUB",
-        occurred_at=datetime(2026, 1, 22, 12, 0, tzinfo=UTC),
+        occurred_at=JAN[22],
         category_id="food",
         account_id=None,
         description="lunch",
@@ -71,134 +90,58 @@ def test_record_transaction_success() -> None:
     assert repo.get(tx.id) is tx
 
 
-def test_record_transaction_invalid_amount() -> None:
-    repo = InMemoryTransactionRepository()
-    service = TransactionService(repo=repo)
-
-    with pytest.raises(DomainValidationError):
-        service.record_transaction(
+@pytest.mark.parametrize(
+    ("tx_type", "amount", "currency", "match"),
+    [
+        ("expense", Decimal("0"), "RUB", _AMOUNT_RE),
+        ("expense", Decimal("1"), "RU", _CURRENCY_RE),
+        ("refund", Decimal("1"), "RUB", _TX_TYPE_RE),
+    ],
+)
+def test_record_transaction_invalid(
+    empty_service: TransactionService,
+    tx_type: str,
+    amount: Decimal,
+    currency: str,
+    match: re.Pattern[str],
+) -> None:
+    with pytest.raises(DomainValidationError, match=match):
+        empty_service.record_transaction(
             user_id="u1",
-            tx_type="expense",
-            amount=Decimal("0"),
-            currency="RUB",
-            occurred_at=datetime(2026, 1, 22, 12, 0, tzinfo=UTC),
+            tx_type=tx_type,
+            amount=amount,
+            currency=currency,
+            occurred_at=JAN[22],
             category_id=None,
             account_id=None,
             description=None,
         )
 
 
-def test_get_transaction_not_found() -> None:
-    repo = InMemoryTransactionRepository()
-    service = TransactionService(repo=repo)
-
+def test_get_transaction_not_found(empty_service: TransactionService) -> None:
     with pytest.raises(NotFoundError):
-        service.get_transaction(user_id="u1", transaction_id="missing")
+        empty_service.get_transaction(user_id="u1", transaction_id="missing")
 
 
-def test_get_transaction_forbidden_other_user() -> None:
-    repo = InMemoryTransactionRepository()
-    service = TransactionService(repo=repo)
-
-    tx = service.record_transaction(
-        user_id="u1",
-        tx_type="income",
-        amount=Decimal("100"),
-        currency="RUB",
-        occurred_at=datetime(2026, 1, 22, 12, 0, tzinfo=UTC),
-        category_id=None,
-        account_id=None,
-        description=None,
-    )
+def test_get_transaction_forbidden_other_user(service: TransactionService) -> None:
+    tx = _record(service, tx_type="income", amount="100")
 
     with pytest.raises(NotFoundError):
         service.get_transaction(user_id="u2", transaction_id=tx.id)
 
 
-def test_list_transactions_only_for_user() -> None:
-    repo = InMemoryTransactionRepository()
-    service = TransactionService(repo=repo)
-
-    service.record_transaction(
-        user_id="u1",
-        tx_type="expense",
-        amount=Decimal("50"),
-        currency="RUB",
-        occurred_at=datetime(2026, 1, 22, 12, 0, tzinfo=UTC),
-        category_id=None,
-        account_id=None,
-        description="u1 tx",
-    )
-    service.record_transaction(
-        user_id="u2",
-        tx_type="income",
-        amount=Decimal("70"),
-        currency="RUB",
-        occurred_at=datetime(2026, 1, 23, 12, 0, tzinfo=UTC),
-        category_id=None,
-        account_id=None,
-        description="u2 tx",
-    )
+def test_list_transactions_only_for_user(service: TransactionService) -> None:
+    _record(service, amount="50", description="u1 tx")
+    _record(service, user_id="u2", tx_type="income", amount="70", description="u2 tx")
 
     transactions = service.list_transactions(user_id="u1")
     assert len(transactions) == 1
     assert transactions[0].user_id == "u1"
 
 
-def test_get_transactions_by_categories_with_total_expense() -> None:
-    repo = InMemoryTransactionRepository()
-    service = TransactionService(repo=repo)
-
-    service.record_transaction(
-        user_id="u1",
-        tx_type="expense",
-        amount=Decimal("100"),
-        currency="RUB",
-        occurred_at=datetime(2026, 1, 10, 12, 0, tzinfo=UTC),
-        category_id="food",
-        account_id=None,
-        description=None,
-    )
-    service.record_transaction(
-        user_id="u1",
-        tx_type="income",
-        amount=Decimal("20"),
-        currency="RUB",
-        occurred_at=datetime(2026, 1, 11, 12, 0, tzinfo=UTC),
-        category_id="food",
-        account_id=None,
-        description=None,
-    )
-    service.record_transaction(
-        user_id="u1",
-        tx_type="expense",
-        amount=Decimal("50"),
-        currency="RUB",
-        occurred_at=datetime(2026, 1, 12, 12, 0, tzinfo=UTC),
-        category_id="transport",
-        account_id=None,
-        description=None,
-    )
-    service.record_transaction(
-        user_id="u1",
-        tx_type="expense",
-        amount=Decimal("200"),
-        currency="RUB",
-        occurred_at=datetime(2026, 1, 13, 12, 0, tzinfo=UTC),
-        category_id="health",
-        account_id=None,
-        description=None,
-    )
-    service.record_transaction(
-        user_id="u2",
-        tx_type="expense",
-        amount=Decimal("999"),
-        currency="RUB",
-        occurred_at=datetime(2026, 1, 14, 12, 0, tzinfo=UTC),
-        category_id="food",
-        account_id=None,
-        description=None,
-    )
+def test_get_transactions_by_categories_with_total_expense(service: TransactionService) -> None:
+    for row in _CATEGORY_ROWS:
+        _record(service, **row)
 
     transactions, total_expense, expense_by_category = service.get_transactions_by_categories(
         user_id="u1",
@@ -206,84 +149,167 @@ def test_get_transactions_by_categories_with_total_expense() -> None:
     )
 
     assert len(transactions) == 3
-    assert total_expense == Decimal("150")
-    assert expense_by_category["food"] == Decimal("100")
-    assert expense_by_category["transport"] == Decimal("50")
-
+    assert total_expense == _CATEGORY_TOTAL
+    assert expense_by_category == _CATEGORY_EXPENSES
 
-def test_get_transactions_by_categories_empty_categories() -> None:
-    repo = InMemoryTransactionRepository()
-    service = TransactionService(repo=repo)
 
+def test_get_transactions_by_categories_empty_categories(empty_service: TransactionService) -> None:
     with pytest.raises(DomainValidationError):
-        service.get_transactions_by_categories(user_id="u1", category_ids=[])
+        empty_service.get_transactions_by_categories(user_id="u1", category_ids=[])
 
 
-def test_get_transactions_for_period_with_category_stats() -> None:
-    repo = InMemoryTransactionRepository()
-    service = TransactionService(repo=repo)
+def test_get_transactions_for_period_with_category_stats(service: TransactionService) -> None:
+    for row in _PERIOD_ROWS:
+        _record(service, **row)
 
-    service.record_transaction(
+    transactions, total_expense, expense_by_category = service.get_transactions_for_period(
         user_id="u1",
-        tx_type="expense",
-        amount=Decimal("100"),
-        currency="RUB",
-        occurred_at=datetime(2026, 1, 5, 12, 0, tzinfo=UTC),
-        category_id="food",
-        account_id=None,
-        description=None,
+        start_at=JAN_START,
+        end_at=JAN_END,
     )
-    service.record_transaction(
-        user_id="u1",
-        tx_type="expense",
-        amount=Decimal("40"),
-        currency="RUB",
-        occurred_at=datetime(2026, 1, 15, 12, 0, tzinfo=UTC),
-        category_id="transport",
-        account_id=None,
-        description=None,
+
+    assert len(transactions) == 3
+    assert total_expense == _PERIOD_TOTAL
+    assert expense_by_category == _PERIOD_EXPENSES
+
+
+def test_get_transactions_for_period_invalid_range(empty_service: TransactionService) -> None:
+    with pytest.raises(DomainValidationError):
+        empty_service.get_transactions_for_period(
+            user_id="u1",
+            start_at=FEB_START,
+            end_at=JAN_START,
+        )
+
+
+def test_analytics_results_are_cached_until_user_records_transaction(
+    repo: InMemoryTransactionRepository,
+) -> None:
+    service = TransactionService(repo=repo, cache=InMemoryQueryCache())
+
+    _record(service, amount="100", category_id="food")
+    _record(service, amount="40", category_id="transport")
+    service.get_transactions_by_categories(user_id="u1", category_ids=["food", "transport"])
+    service.get_transactions_for_period(user_id="u1", start_at=JAN_START, end_at=JAN_END)
+
+    # Bypass the service: cached results must not see this row.
+    repo.add(make_tx(amount="1", occurred_at=JAN[11], category_id="food"))
+
+    transactions, total_expense, by_category = service.get_transactions_by_categories(
+        user_id="u1", category_ids=["transport", "food"]
     )
-    service.record_transaction(
-        user_id="u1",
-        tx_type="income",
-        amount=Decimal("500"),
-        currency="RUB",
-        occurred_at=datetime(2026, 1, 20, 12, 0, tzinfo=UTC),
-        category_id="salary",
-        account_id=None,
-        description=None,
+    assert len(transactions) == 2
+    assert total_expense == Decimal("140")
+    assert list(by_category) == ["transport", "food"]
+    _, period_total, _ = service.get_transactions_for_period(
+        user_id="u1", start_at=JAN_START, end_at=JAN_END
     )
-    service.record_transaction(
-        user_id="u1",
-        tx_type="expense",
-        amount=Decimal("80"),
-        currency="RUB",
-        occurred_at=datetime(2026, 2, 1, 12, 0, tzinfo=UTC),
-        category_id="food",
-        account_id=None,
-        description=None,
+    assert period_total == Decimal("140")
+
+    _record(service, amount="10", category_id="food")
+
+    _, total_expense, by_category = service.get_transactions_by_categories(
+        user_id="u1", category_ids=["food"]
     )
+    assert total_expense == Decimal("111")
+    _, period_total, _ = service.get_transactions_for_period(
+        user_id="u1", start_at=JAN_START, end_at=JAN_END
+    )
+    assert period_total == Decimal("151")
 
-    transactions, total_expense, expense_by_category = service.get_transactions_for_period(
-        user_id="u1",
-        start_at=datetime(2026, 1, 1, 0, 0, tzinfo=UTC),
-        end_at=datetime(2026, 1, 31, 23, 59, tzinfo=UTC),
+
+def test_analytics_result_read_before_concurrent_write_is_not_cached(
+    repo: InMemoryTransactionRepository, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    service = TransactionService(repo=repo, cache=InMemoryQueryCache())
+    _record(service, amount="100", category_id="food")
+
+    # Another request records (and invalidates) after the list read, before the aggregate.
+    for name in ("aggregate_expense_by_categories", "aggregate_expense_by_period"):
+        aggregate = getattr(repo, name)
+
+        def _aggregate_after_write(*args: Any, _aggregate: Any = aggregate, **kwargs: Any) -> Any:
+            result = _aggregate(*args, **kwargs)
+            _record(service, amount="10", category_id="food")
+            return result
+
+        monkeypatch.setattr(repo, name, _aggregate_after_write)
+    service.get_transactions_by_categories(user_id="u1", category_ids=["food"])
+    service.get_transactions_for_period(user_id="u1", start_at=JAN_START, end_at=JAN_END)
+    monkeypatch.undo()
+
+    _, total_expense, _ = service.get_transactions_by_categories(
+        user_id="u1", category_ids=["food"]
     )
+    assert total_expense == Decimal("120")
+    _, period_total, _ = service.get_transactions_for_period(
+        user_id="u1", start_at=JAN_START, end_at=JAN_END
+    )
+    assert period_total == Decimal("120")
 
-    assert len(transactions) == 3
-    assert total_expense == Decimal("140")
-    assert expense_by_category["food"] == Decimal("100")
-    assert expense_by_category["transport"] == Decimal("40")
-    assert "salary" not in expense_by_category
 
+def test_record_transactions_saves_whole_batch(service: TransactionService) -> None:
+    transactions = service.record_transactions(
+        user_id="u1",
+        items=[
+            NewTransaction(
+                tx_type="expense",
+                amount=Decimal("10"),
+                currency="RUB",
+                occurred_at=JAN[10].replace(tzinfo=None),
+                category_id="food",
+            ),
+            NewTransaction(
+                tx_type="income",
+                amount=Decimal("20"),
+                currency="RUB",
+                occurred_at=JAN[11],
+            ),
+        ],
+    )
+
+    assert [tx.type.value for tx in transactions] == ["expense", "income"]
+    assert transactions[0].occurred_at.tzinfo is UTC
+    assert {tx.id for tx in service.list_transactions(user_id="u1")} == {
+        tx.id for tx in transactions
+    }
+    assert service.record_transactions(user_id="u1", items=[]) == []
 
-def test_get_transactions_for_period_invalid_range() -> None:
-    repo = InMemoryTransactionRepository()
-    service = TransactionService(repo=repo)
 
+def test_record_transactions_rejects_batch_with_invalid_item(service: TransactionService) -> None:
     with pytest.raises(DomainValidationError):
-        service.get_transactions_for_period(
+        service.record_transactions(
             user_id="u1",
-            start_at=datetime(2026, 2, 1, 0, 0, tzinfo=UTC),
-            end_at=datetime(2026, 1, 1, 0, 0, tzinfo=UTC),
+            items=[
+                NewTransaction(
+                    tx_type="expense",
+                    amount=Decimal("10"),
+                    currency="RUB",
+                    occurred_at=JAN[10],
+                ),
+                NewTransaction(
+                    tx_type="expense",
+                    amount=Decimal("0"),
+                    currency="RUB",
+                    occurred_at=JAN[10],
+                ),
+            ],
         )
+
+    assert service.list_transactions(user_id="u1") == []
+
+
+def test_get_transactions_by_categories_ignores_duplicate_ids(service: TransactionService) -> None:
+    _record(service, amount="30", category_id="food")
+
+    transactions, total_expense, expense_by_category = service.get_transactions_by_categories(
+        user_id="u1",
+        category_ids=["transport", "food", "transport"],
+    )
+
+    assert len(transactions) == 1
+    assert total_expense == Decimal("30")
+    assert list(expense_by_category.items()) == [
+        ("transport", Decimal("0")),
+        ("food", Decimal("30")),
+    ]